@@ -12,10 +12,22 @@ import logging
 import traceback
 import threading
 import time
+import queue
 from typing import Dict, List, Any, Callable, Optional
 from datetime import datetime
-import json
-import weakref
+
+
+# sys.exception() (3.11+) returns the active exception directly, avoiding
+# the thread-state walk that sys.exc_info() performs on older versions
+if sys.version_info >= (3, 11):
+    def _exc_info():
+        """Return (type, value, traceback) for the exception being handled"""
+        exc = sys.exception()
+        if exc is None:
+            return (None, None, None)
+        return (type(exc), exc, exc.__traceback__)
+else:
+    _exc_info = sys.exc_info
 
 
 class ExceptionHandler:
@@ -26,7 +38,16 @@ class ExceptionHandler:
         self.original_excepthook = sys.excepthook
         self.original_unraisablehook = sys.unraisablehook
         self.exception_counts: Dict[str, int] = {}
-        self.recovery_actions: Dict[str, Callable] = {}
+        self.recovery_actions: Dict[type, Callable] = {}
+        self._recovery_cache: Dict[type, Optional[Callable]] = {}
+        # Bumped on every change so statistics are only rebuilt when stale
+        self._stats_version = 0
+        self._cached_version = -1
+        self._cached_stats: Dict[str, Any] = {}
+        self._cached_stats_json: Optional[bytes] = None
+        # Pre-built notices so the hooks do a single write per event
+        self._uncaught_msg = f"Uncaught exception logged to {log_file}\n"
+        self._unraisable_msg = f"Unraisable exception logged to {log_file}\n"
         self.setup_logging()
 
     def setup_logging(self):
@@ -43,12 +64,13 @@ class ExceptionHandler:
         # Count exception types
         exc_name = exc_type.__name__
         self.exception_counts[exc_name] = self.exception_counts.get(exc_name, 0) + 1
+        self._stats_version += 1
 
         # Log the exception
         self.log_exception(exc_type, exc_value, exc_traceback, "Uncaught exception")
 
         # Print to stderr
-        print(f"Uncaught exception logged to {self.log_file}", file=sys.stderr)
+        sys.stderr.write(self._uncaught_msg)
 
         # Call original hook
         self.original_excepthook(exc_type, exc_value, exc_traceback)
@@ -60,42 +82,56 @@ class ExceptionHandler:
 
         exc_name = type(exception).__name__
         self.exception_counts[exc_name] = self.exception_counts.get(exc_name, 0) + 1
+        self._stats_version += 1
 
         # Log unraisable exception
         logging.error(f"Unraisable exception: {exc_name}: {exception} - {err_msg}")
 
-        print(f"Unraisable exception logged to {self.log_file}", file=sys.stderr)
+        sys.stderr.write(self._unraisable_msg)
 
     def log_exception(self, exc_type, exc_value, exc_traceback, context: str = ""):
         """Log an exception with full details"""
-        # Format traceback
-        tb_lines = traceback.format_exception(exc_type, exc_value, exc_traceback)
-        tb_text = ''.join(tb_lines)
-
-        # Create log message
-        log_message = f"Exception: {exc_type.__name__}: {exc_value}"
-        if context:
-            log_message += f" (Context: {context})"
-
-        # Log to file
-        logging.error(log_message)
-        logging.error("Traceback:\n%s", tb_text)
+        # Pass exc_info so logging formats the traceback lazily, only
+        # when a handler actually accepts the record
+        logging.error(
+            "Exception: %s: %s (Context: %s)",
+            exc_type.__name__, exc_value, context or "none",
+            exc_info=(exc_type, exc_value, exc_traceback)
+        )
 
-    def register_recovery(self, exc_type: str, action: Callable):
+    def register_recovery(self, exc_type: type, action: Callable):
         """Register recovery action for specific exception type"""
         self.recovery_actions[exc_type] = action
+        self._recovery_cache.clear()
+        self._stats_version += 1
+
+    def _find_recovery(self, exc_type: type) -> Optional[Callable]:
+        """Find the recovery action for exc_type or its nearest base class"""
+        try:
+            return self._recovery_cache[exc_type]
+        except KeyError:
+            pass
+
+        action = None
+        for base in exc_type.__mro__:
+            if base in self.recovery_actions:
+                action = self.recovery_actions[base]
+                break
+
+        self._recovery_cache[exc_type] = action
+        return action
 
     def attempt_recovery(self, func: Callable, *args, **kwargs):
         """Execute function with recovery"""
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            exc_name = type(e).__name__
+            action = self._find_recovery(type(e))
 
-            if exc_name in self.recovery_actions:
-                print(f"Attempting recovery for {exc_name}...")
+            if action is not None:
+                print(f"Attempting recovery for {type(e).__name__}...")
                 try:
-                    recovery_result = self.recovery_actions[exc_name](e)
+                    recovery_result = action(e)
                     if recovery_result:
                         print("Recovery successful")
                         return recovery_result
@@ -117,21 +153,49 @@ class ExceptionHandler:
         sys.unraisablehook = self.original_unraisablehook
         print("Original exception hooks restored")
 
+    def _current_statistics(self) -> Dict[str, Any]:
+        """Return the cached statistics dict, rebuilding it if stale"""
+        if self._cached_version != self._stats_version:
+            self._cached_stats = {
+                'total_exceptions': sum(self.exception_counts.values()),
+                'exception_types': self.exception_counts.copy(),
+                'recovery_actions': [exc_type.__name__ for exc_type in self.recovery_actions],
+            }
+            self._cached_stats_json = None
+            self._cached_version = self._stats_version
+        return self._cached_stats
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get exception handling statistics"""
+        # Hand out copies so callers cannot mutate the cached snapshot
+        stats = self._current_statistics()
         return {
-            'total_exceptions': sum(self.exception_counts.values()),
-            'exception_types': self.exception_counts.copy(),
-            'recovery_actions': list(self.recovery_actions.keys()),
+            'total_exceptions': stats['total_exceptions'],
+            'exception_types': dict(stats['exception_types']),
+            'recovery_actions': list(stats['recovery_actions']),
         }
 
+    def get_statistics_json(self) -> bytes:
+        """Get exception handling statistics serialized as JSON"""
+        stats = self._current_statistics()
+        if self._cached_stats_json is None:
+            try:
+                import orjson
+                self._cached_stats_json = orjson.dumps(stats)
+            except ImportError:
+                import json
+                self._cached_stats_json = json.dumps(stats).encode()
+        return self._cached_stats_json
+
 
 class ThreadExceptionHandler:
     """Handle exceptions in multi-threaded applications"""
 
     def __init__(self):
         self.thread_exceptions: Dict[int, Dict[str, Any]] = {}
-        self.lock = threading.Lock()
+        # SimpleQueue is implemented in C and needs no Python-level lock,
+        # so failing threads never contend with each other in the hook
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
 
     def thread_excepthook(self, args):
         """Handle thread exceptions"""
@@ -144,24 +208,32 @@ class ThreadExceptionHandler:
             'type': exc_type,
             'value': exc_value,
             'traceback': exc_traceback,
-            'timestamp': datetime.now(),
+            'timestamp_ns': time.time_ns(),
             'thread_name': args.thread.name,
         }
 
-        with self.lock:
-            self.thread_exceptions[thread_id] = exception_info
+        self._queue.put_nowait((thread_id, exception_info))
 
         print(f"Exception in thread {args.thread.name} (ID: {thread_id}): {exc_type.__name__}: {exc_value}")
 
+    def _drain(self):
+        """Move queued exceptions into the thread_exceptions dict"""
+        while True:
+            try:
+                thread_id, exception_info = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.thread_exceptions[thread_id] = exception_info
+
     def get_thread_exceptions(self) -> Dict[int, Dict[str, Any]]:
         """Get all thread exceptions"""
-        with self.lock:
-            return self.thread_exceptions.copy()
+        self._drain()
+        return dict(self.thread_exceptions)
 
     def clear_exceptions(self):
         """Clear stored thread exceptions"""
-        with self.lock:
-            self.thread_exceptions.clear()
+        self._drain()
+        self.thread_exceptions = {}
 
     def install(self):
         """Install thread exception hook"""
@@ -228,9 +300,9 @@ def recovery_system_demo():
         except:
             return None
 
-    handler.register_recovery("ZeroDivisionError", lambda e: "Division by zero handled")
-    handler.register_recovery("ConnectionError", handle_connection_error)
-    handler.register_recovery("FileNotFoundError", handle_file_error)
+    handler.register_recovery(ZeroDivisionError, lambda e: "Division by zero handled")
+    handler.register_recovery(ConnectionError, handle_connection_error)
+    handler.register_recovery(FileNotFoundError, handle_file_error)
 
     def test_operations():
         """Test operations that may fail"""
@@ -254,6 +326,8 @@ def recovery_system_demo():
 
 def custom_hooks_demo():
     """Demonstrate custom exception hooks"""
+    import weakref
+
     print("Custom Exception Hooks Demo")
     print("=" * 28)
 
@@ -339,35 +413,39 @@ def exception_filter_demo():
     print("=" * 24)
 
     class ExceptionFilter:
-        """Filter and handle exceptions based on criteria"""
+        """Filter and handle exceptions based on their type"""
 
         def __init__(self):
-            self.filters = []
+            self.dispatch: Dict[type, Optional[Callable]] = {}
 
-        def add_filter(self, condition: Callable, handler: Callable):
-            """Add a filter with handler"""
-            self.filters.append((condition, handler))
+        def add_filter(self, exc_types: tuple, handler: Callable):
+            """Register a handler for one or more exception types"""
+            for exc_type in exc_types:
+                self.dispatch[exc_type] = handler
 
         def handle_exception(self, exc_info):
-            """Handle exception using filters"""
+            """Handle exception using registered filters"""
             exc_type, exc_value, exc_traceback = exc_info
 
-            for condition, handler in self.filters:
-                if condition(exc_type, exc_value):
-                    return handler(exc_type, exc_value, exc_traceback)
-
-            return False  # No filter matched
+            try:
+                handler = self.dispatch[exc_type]
+            except KeyError:
+                # Resolve via the MRO once, then memoize for this exact type
+                handler = None
+                for base in exc_type.__mro__[1:]:
+                    if base in self.dispatch:
+                        handler = self.dispatch[base]
+                        break
+                self.dispatch[exc_type] = handler
+
+            if handler is None:
+                return False  # No filter matched
+            return handler(exc_type, exc_value, exc_traceback)
 
     # Create filter
     exc_filter = ExceptionFilter()
 
     # Add filters
-    def is_network_error(exc_type, exc_value):
-        return exc_type.__name__ in ('ConnectionError', 'TimeoutError')
-
-    def is_file_error(exc_type, exc_value):
-        return exc_type.__name__ in ('FileNotFoundError', 'PermissionError')
-
     def handle_network_error(exc_type, exc_value, exc_traceback):
         print(f"Network error handled: {exc_value}")
         return "Network recovered"
@@ -376,8 +454,8 @@ def exception_filter_demo():
         print(f"File error handled: {exc_value}")
         return "File error recovered"
 
-    exc_filter.add_filter(is_network_error, handle_network_error)
-    exc_filter.add_filter(is_file_error, handle_file_error)
+    exc_filter.add_filter((ConnectionError, TimeoutError), handle_network_error)
+    exc_filter.add_filter((FileNotFoundError, PermissionError), handle_file_error)
 
     # Test filtering
     test_exceptions = [
@@ -390,7 +468,7 @@ def exception_filter_demo():
         try:
             raise exc
         except:
-            result = exc_filter.handle_exception(sys.exc_info())
+            result = exc_filter.handle_exception(_exc_info())
             if result:
                 print(f"{desc}: {result}")
             else:
@@ -416,7 +494,7 @@ def comprehensive_error_handler():
             exc_type, exc_value, exc_traceback = exc_info
 
             error_entry = {
-                'timestamp': datetime.now(),
+                'timestamp_ns': time.time_ns(),
                 'type': exc_type.__name__,
                 'value': str(exc_value),
                 'context': context,
@@ -426,29 +504,39 @@ def comprehensive_error_handler():
             self.error_log.append(error_entry)
             self.error_counts[exc_type.__name__] = self.error_counts.get(exc_type.__name__, 0) + 1
 
+        def _recover_file(exc_value):
+            """Try to create the missing file"""
+            try:
+                with open('recovered_file.txt', 'w') as f:
+                    f.write('Created by recovery system\n')
+                return "File created"
+            except OSError:
+                return None
+
+        def _recover_division(exc_value):
+            """Treat division by zero as handled"""
+            return "Division by zero handled"
+
+        # Recovery strategies keyed by exception class
+        RECOVERY = {
+            FileNotFoundError: _recover_file,
+            ZeroDivisionError: _recover_division,
+        }
+
         def attempt_recovery(self, exc_info):
             """Attempt to recover from exception"""
             exc_type, exc_value, exc_traceback = exc_info
-            exc_name = exc_type.__name__
 
             self.recovery_attempts += 1
 
-            # Recovery strategies
-            if exc_name == 'FileNotFoundError':
-                # Try to create the file
-                try:
-                    with open('recovered_file.txt', 'w') as f:
-                        f.write('Created by recovery system\n')
-                    self.successful_recoveries += 1
-                    return "File created"
-                except:
-                    pass
-
-            elif exc_name == 'ZeroDivisionError':
-                self.successful_recoveries += 1
-                return "Division by zero handled"
+            recover = self.RECOVERY.get(exc_type)
+            if recover is None:
+                return None
 
-            return None
+            result = recover(exc_value)
+            if result:
+                self.successful_recoveries += 1
+            return result
 
         def handle_exception(self, exc_info, context=""):
             """Handle an exception comprehensively"""
@@ -463,11 +551,17 @@ def comprehensive_error_handler():
 
         def get_report(self):
             """Generate error report"""
+            # Timestamps are stored as raw integers; only convert the
+            # entries that are actually reported
+            recent_errors = [
+                {**entry, 'timestamp': datetime.fromtimestamp(entry['timestamp_ns'] / 1e9)}
+                for entry in self.error_log[-5:]  # Last 5 errors
+            ]
             return {
                 'total_errors': len(self.error_log),
                 'error_types': self.error_counts,
                 'recovery_rate': self.successful_recoveries / max(self.recovery_attempts, 1),
-                'recent_errors': self.error_log[-5:]  # Last 5 errors
+                'recent_errors': recent_errors
             }
 
     # Test comprehensive handler
@@ -488,7 +582,7 @@ def comprehensive_error_handler():
                 result = operation()
                 print(f"{desc}: Success - {result}")
             except Exception as e:
-                recovery = handler.handle_exception(sys.exc_info(), desc)
+                recovery = handler.handle_exception(_exc_info(), desc)
                 if recovery:
                     print(f"{desc}: Recovered - {recovery}")
                 else:
@@ -504,24 +598,25 @@ def comprehensive_error_handler():
     print(".1%")
 
 
+DEMOS = {
+    'logging': exception_logging_demo,
+    'recovery': recovery_system_demo,
+    'hooks': custom_hooks_demo,
+    'threads': thread_exception_demo,
+    'filter': exception_filter_demo,
+    'comprehensive': comprehensive_error_handler,
+}
+
+
 def main():
     """Main function with different exception handling demonstrations"""
 
-    demos = {
-        'logging': exception_logging_demo,
-        'recovery': recovery_system_demo,
-        'hooks': custom_hooks_demo,
-        'threads': thread_exception_demo,
-        'filter': exception_filter_demo,
-        'comprehensive': comprehensive_error_handler,
-    }
-
     if len(sys.argv) < 2:
         print("Exception Handling Demonstrations")
         print("===================================")
         print()
         print("Available demonstrations:")
-        for name in demos.keys():
+        for name in DEMOS.keys():
             print(f"  {name}")
         print()
         print("Usage: python exception_hooks.py <demo_name>")
@@ -529,21 +624,22 @@ def main():
         return
 
     demo_name = sys.argv[1].lower()
+    demo = DEMOS.get(demo_name)
 
-    if demo_name in demos:
-        try:
-            demos[demo_name]()
-        except KeyboardInterrupt:
-            print("\nDemo interrupted by user")
-        except Exception as e:
-            print(f"\nDemo failed: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
+    if demo is None:
         sys.stderr.write(f"Unknown demonstration: {demo_name}\n")
-        sys.stderr.write(f"Available demos: {', '.join(demos.keys())}\n")
+        sys.stderr.write(f"Available demos: {', '.join(DEMOS.keys())}\n")
         sys.exit(1)
 
+    try:
+        demo()
+    except KeyboardInterrupt:
+        print("\nDemo interrupted by user")
+    except Exception as e:
+        print(f"\nDemo failed: {e}")
+        import traceback
+        traceback.print_exc()
+
 
 if __name__ == "__main__":
     main()
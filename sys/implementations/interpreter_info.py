@@ -10,6 +10,54 @@ platform information, and runtime characteristics.
 import sys
 import platform
 import os
+import bisect
+from functools import lru_cache
+from typing import Optional
+
+
+# Feature tiers sorted by the sys.hexversion at which they become available
+_FEATURE_TIERS = (
+    (0x03060000, "3.6+"),
+    (0x03070000, "3.7+"),
+    (0x03080000, "3.8+"),
+    (0x03090000, "3.9+"),
+    (0x030A0000, "3.10+"),
+)
+
+# Feature flags are constant for the lifetime of the interpreter, so
+# locate the highest supported tier once at import time
+_SUPPORTED_TIERS = bisect.bisect_right([tier for tier, _ in _FEATURE_TIERS], sys.hexversion)
+_FEATURES = {
+    name: index < _SUPPORTED_TIERS
+    for index, (_, name) in enumerate(_FEATURE_TIERS)
+}
+
+
+@lru_cache(maxsize=None)
+def _parse_version(req_version: str):
+    """Parse a version string like "3.8" into a (major, minor) tuple"""
+    major, minor = map(int, req_version.split('.'))
+    return (major, minor)
+
+
+@lru_cache(maxsize=None)
+def _linux_distribution() -> Optional[str]:
+    """Read the Linux distribution name once per interpreter run"""
+    if hasattr(platform, 'freedesktop_os_release'):
+        # Python 3.10+ parses (and caches) /etc/os-release itself
+        try:
+            return platform.freedesktop_os_release().get('PRETTY_NAME')
+        except OSError:
+            return None
+
+    try:
+        with open('/etc/os-release', 'r') as f:
+            for line in f:
+                if line.startswith('PRETTY_NAME'):
+                    return line.split('=', 1)[1].strip().strip('"')
+    except FileNotFoundError:
+        pass
+    return None
 
 
 def basic_interpreter_info():
@@ -34,7 +82,7 @@ def version_checking():
     print("=" * 35)
 
     # Check Python version
-    if sys.version_info >= (3, 8):
+    if _FEATURES["3.8+"]:
         print("✓ Python 3.8+ detected")
     else:
         print("✗ Python 3.8+ required")
@@ -47,17 +95,8 @@ def version_checking():
     print(f"Release Level: {version.releaselevel}")
     print(f"Serial: {version.serial}")
 
-    # Check for specific features
-    features = {
-        "3.6+": version >= (3, 6),
-        "3.7+": version >= (3, 7),
-        "3.8+": version >= (3, 8),
-        "3.9+": version >= (3, 9),
-        "3.10+": version >= (3, 10),
-    }
-
     print("\nFeature Support:")
-    for feature, supported in features.items():
+    for feature, supported in _FEATURES.items():
         status = "✓" if supported else "✗"
         print(f"  {status} {feature}")
 
@@ -79,13 +118,10 @@ def platform_detection():
     elif platform_name.startswith('linux'):
         print("Running on Linux")
         # Linux-specific code
-        try:
-            with open('/etc/os-release', 'r') as f:
-                for line in f:
-                    if line.startswith('PRETTY_NAME'):
-                        print(f"Distribution: {line.split('=')[1].strip().strip('\"')}")
-                        break
-        except FileNotFoundError:
+        distribution = _linux_distribution()
+        if distribution:
+            print(f"Distribution: {distribution}")
+        else:
             print("Could not determine Linux distribution")
 
     elif platform_name.startswith('darwin'):
@@ -288,8 +324,7 @@ def compatibility_checker():
                 results[req_name] = current >= req_version
             else:
                 # Assume string like "3.8"
-                major, minor = map(int, req_version.split('.'))
-                results[req_name] = current >= (major, minor)
+                results[req_name] = current >= _parse_version(req_version)
 
         return results
 
@@ -341,29 +376,30 @@ def runtime_inspection():
         print("Running from script")
 
 
+EXAMPLES = {
+    'basic': basic_interpreter_info,
+    'version': version_checking,
+    'platform': platform_detection,
+    'implementation': implementation_details,
+    'path': path_and_modules,
+    'threading': threading_and_async,
+    'performance': performance_flags,
+    'environment': environment_variables,
+    'limits': system_limits,
+    'compatibility': compatibility_checker,
+    'runtime': runtime_inspection,
+}
+
+
 def main():
     """Main function to run all interpreter info examples"""
 
-    examples = {
-        'basic': basic_interpreter_info,
-        'version': version_checking,
-        'platform': platform_detection,
-        'implementation': implementation_details,
-        'path': path_and_modules,
-        'threading': threading_and_async,
-        'performance': performance_flags,
-        'environment': environment_variables,
-        'limits': system_limits,
-        'compatibility': compatibility_checker,
-        'runtime': runtime_inspection,
-    }
-
     if len(sys.argv) < 2:
         print("Interpreter Information Examples")
         print("===============================")
         print()
         print("Available examples:")
-        for name in examples.keys():
+        for name in EXAMPLES.keys():
             print(f"  {name}")
         print()
         print("Usage: python interpreter_info.py <example_name>")
@@ -371,19 +407,20 @@ def main():
         return
 
     example_name = sys.argv[1].lower()
+    example = EXAMPLES.get(example_name)
 
-    if example_name in examples:
-        try:
-            examples[example_name]()
-        except Exception as e:
-            print(f"Error running example '{example_name}': {e}")
-            import traceback
-            traceback.print_exc()
-    else:
+    if example is None:
         print(f"Unknown example: {example_name}")
-        print(f"Available examples: {', '.join(examples.keys())}")
+        print(f"Available examples: {', '.join(EXAMPLES.keys())}")
         sys.exit(1)
 
+    try:
+        example()
+    except Exception as e:
+        print(f"Error running example '{example_name}': {e}")
+        import traceback
+        traceback.print_exc()
+
 
 if __name__ == "__main__":
     main()
@@ -8,12 +8,37 @@ memory usage in Python applications using the sys module and related tools.
 
 import sys
 import gc
-import psutil
 import os
-from collections import defaultdict
+import types
+import weakref
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+from time import perf_counter
+from collections import defaultdict, deque
 from typing import Dict, List, Any, Optional, Tuple
 
 
+# Immutable payload shared by every object in memory_leak_detection
+_PAYLOAD = tuple(range(100))
+
+
+@contextmanager
+def gc_paused():
+    """Suspend generational GC while building short-lived containers
+
+    Allocation bursts otherwise trigger repeated generation-0 scans over
+    containers that are about to be discarded anyway.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 def basic_memory_monitoring():
     """Demonstrate basic memory monitoring using sys.getallocatedblocks()"""
     print("Basic Memory Monitoring")
@@ -25,8 +50,9 @@ def basic_memory_monitoring():
 
     # Create some objects
     data = []
-    for i in range(1000):
-        data.append([i] * 100)  # Create lists with repeated values
+    with gc_paused():
+        for i in range(1000):
+            data.append([i] * 100)  # Create lists with repeated values
 
     after_creation = sys.getallocatedblocks()
     print(f"After creating 1000 lists: {after_creation}")
@@ -46,6 +72,8 @@ def object_size_analysis():
     print("\nObject Size Analysis")
     print("=" * 21)
 
+    getsizeof = sys.getsizeof  # Local name avoids repeated global lookups
+
     test_objects = {
         'integer': 42,
         'float': 3.14159,
@@ -64,28 +92,24 @@ def object_size_analysis():
     print("Object sizes (shallow):")
     print("-" * 30)
     for name, obj in test_objects.items():
-        size = sys.getsizeof(obj)
+        size = getsizeof(obj)
         print(f"{name:25} {size}")
 
+    steps = range(0, 1001, 100)
+
     # Analyze list growth
     print("\nList size growth:")
     print("-" * 20)
-    sizes = []
-    for i in range(0, 1001, 100):
-        lst = list(range(i))
-        size = sys.getsizeof(lst)
-        sizes.append((i, size))
+    sizes = [(i, getsizeof(list(range(i)))) for i in steps]
+    for i, size in sizes:
         print(f"{i:8} {size}")
 
-    # Analyze dict growth
+    # Analyze dict growth (dict.fromkeys builds the dict in C)
     print("\nDictionary size growth:")
     print("-" * 25)
-    dict_sizes = []
-    for i in range(0, 1001, 100):
-        d = {j: j for j in range(i)}
-        size = sys.getsizeof(d)
-        dict_sizes.append((i, size))
-        print("8")
+    dict_sizes = [(i, getsizeof(dict.fromkeys(range(i)))) for i in steps]
+    for i, size in dict_sizes:
+        print(f"{i:8} {size}")
 
 
 def recursive_memory_calculation():
@@ -93,27 +117,29 @@ def recursive_memory_calculation():
     print("\nRecursive Memory Calculation")
     print("=" * 30)
 
-    def get_total_size(obj, seen=None):
-        """Recursively calculate total memory usage"""
-        if seen is None:
-            seen = set()
-
-        obj_id = id(obj)
-        if obj_id in seen:
-            return 0
-
-        seen.add(obj_id)
-        size = sys.getsizeof(obj)
-
-        if isinstance(obj, (list, tuple, set, frozenset)):
-            size += sum(get_total_size(item, seen) for item in obj)
-        elif isinstance(obj, dict):
-            size += sum(get_total_size(k, seen) + get_total_size(v, seen)
-                       for k, v in obj.items())
-        elif hasattr(obj, '__dict__'):
-            size += get_total_size(obj.__dict__, seen)
-
-        return size
+    def get_total_size(obj):
+        """Calculate total memory usage by walking referents iteratively"""
+        # Shared objects such as classes, modules and functions are not
+        # owned by the data structure, so leave them out of the total
+        excluded = (type, types.ModuleType, types.FunctionType)
+        getsizeof = sys.getsizeof
+        seen = set()
+        total = 0
+        pending = deque([obj])
+
+        while pending:
+            current = pending.popleft()
+            if isinstance(current, excluded) or id(current) in seen:
+                continue
+
+            seen.add(id(current))
+            total += getsizeof(current)
+            pending.extend(gc.get_referents(current))
+            if isinstance(current, dict):
+                # Dicts with only string keys do not report them as referents
+                pending.extend(current.keys())
+
+        return total
 
     # Test with nested structures
     nested_data = {
@@ -140,13 +166,13 @@ def memory_profile_function(func):
         initial_blocks = sys.getallocatedblocks()
 
         # Record starting time and memory
-        start_time = __import__('time').time()
+        start_time = perf_counter()
 
         # Execute function
         result = func(*args, **kwargs)
 
         # Calculate execution time
-        end_time = __import__('time').time()
+        end_time = perf_counter()
         execution_time = end_time - start_time
 
         # Get final memory state
@@ -166,15 +192,16 @@ def memory_profile_function(func):
 @memory_profile_function
 def memory_intensive_operation():
     """A memory-intensive operation for profiling"""
-    data = []
-    for i in range(1000):
-        # Create nested data structures
-        item = {
-            'id': i,
-            'data': list(range(100)),
-            'metadata': {'created': True, 'size': 100}
-        }
-        data.append(item)
+    # Create nested data structures
+    with gc_paused():
+        data = [
+            {
+                'id': i,
+                'data': list(range(100)),
+                'metadata': {'created': True, 'size': 100}
+            }
+            for i in range(1000)
+        ]
 
     # Process data
     total = sum(item['id'] for item in data)
@@ -223,51 +250,69 @@ def memory_efficient_data_structures():
     print("\nMemory-Efficient Data Structures")
     print("=" * 35)
 
+    getsizeof = sys.getsizeof  # Local name avoids repeated global lookups
+
     # Test different ways to store the same data
     data_size = 1000
 
+    # Build the names once and share them across every layout below
+    names = tuple(f"item_{i}" for i in range(data_size))
+
     # Method 1: List of tuples
-    list_of_tuples = [(i, i**2, f"item_{i}") for i in range(data_size)]
-    list_size = sys.getsizeof(list_of_tuples)
+    list_of_tuples = [(i, i**2, names[i]) for i in range(data_size)]
+    list_size = getsizeof(list_of_tuples)
     for item in list_of_tuples:
-        list_size += sys.getsizeof(item)
+        list_size += getsizeof(item)
 
     # Method 2: List of lists
-    list_of_lists = [[i, i**2, f"item_{i}"] for i in range(data_size)]
-    list_list_size = sys.getsizeof(list_of_lists)
+    list_of_lists = [[i, i**2, names[i]] for i in range(data_size)]
+    list_list_size = getsizeof(list_of_lists)
     for item in list_of_lists:
-        list_list_size += sys.getsizeof(item)
+        list_list_size += getsizeof(item)
 
     # Method 3: Dictionary
-    dict_data = {i: {'square': i**2, 'name': f"item_{i}"} for i in range(data_size)}
-    dict_size = sys.getsizeof(dict_data)
+    dict_data = {i: {'square': i**2, 'name': names[i]} for i in range(data_size)}
+    dict_size = getsizeof(dict_data)
     for key, value in dict_data.items():
-        dict_size += sys.getsizeof(key) + sys.getsizeof(value)
+        dict_size += getsizeof(key) + getsizeof(value)
 
     # Method 4: Class instances
     class DataItem:
+        # __slots__ stores attributes at fixed offsets, so instances
+        # carry no per-instance __dict__
+        __slots__ = ('id', 'square', 'name')
+
         def __init__(self, id_val, square, name):
             self.id = id_val
             self.square = square
             self.name = name
 
-    class_instances = [DataItem(i, i**2, f"item_{i}") for i in range(data_size)]
-    class_size = sys.getsizeof(class_instances)
+    class_instances = [DataItem(i, i**2, names[i]) for i in range(data_size)]
+    class_size = getsizeof(class_instances)
     for item in class_instances:
-        class_size += sys.getsizeof(item) + sys.getsizeof(item.__dict__)
+        class_size += getsizeof(item)
+
+    # Method 5: Parallel columns (structure of arrays)
+    # Numbers live unboxed in contiguous typed arrays instead of one
+    # Python object per value
+    ids = array('q', range(data_size))
+    squares = array('q', (i * i for i in ids))
+    columns_size = getsizeof(ids) + getsizeof(squares) + getsizeof(names)
 
     print("Memory usage comparison:")
     print(f"  List of tuples: {list_size} bytes")
     print(f"  List of lists:  {list_list_size} bytes")
     print(f"  Dictionary:     {dict_size} bytes")
     print(f"  Class instances: {class_size} bytes")
+    print(f"  Columns (SoA):  {columns_size} bytes")
 
     # Find most efficient
     methods = {
         'List of tuples': list_size,
         'List of lists': list_list_size,
         'Dictionary': dict_size,
-        'Class instances': class_size
+        'Class instances': class_size,
+        'Columns (SoA)': columns_size,
     }
 
     most_efficient = min(methods.items(), key=lambda x: x[1])
@@ -281,6 +326,8 @@ def garbage_collection_insights():
 
     # Create objects with circular references
     class Node:
+        __slots__ = ('value', 'next', '__weakref__')
+
         def __init__(self, value):
             self.value = value
             self.next = None
@@ -309,6 +356,34 @@ def garbage_collection_insights():
     print(f"Blocks after GC: {after_gc}")
     print(f"Blocks freed by GC: {after_del - after_gc}")
 
+    # Same pair, but the back link is a weak reference, so there is no
+    # strong cycle and reference counting alone frees both nodes
+    print("\nWith a weakref back link:")
+    node1 = Node(1)
+    node2 = Node(2)
+    node1.next = node2
+    node2.next = weakref.ref(node1)
+
+    initial_blocks = sys.getallocatedblocks()
+    print(f"Blocks before deleting references: {initial_blocks}")
+
+    del node1
+    del node2
+
+    after_del = sys.getallocatedblocks()
+    print(f"Blocks after deleting references: {after_del}")
+    print(f"Blocks freed by refcounting: {initial_blocks - after_del}")
+
+    collected = gc.collect()
+    print(f"Objects collected by GC: {collected}")
+
+
+@lru_cache(maxsize=None)
+def _current_process():
+    """Create the psutil process handle on first use and reuse it after"""
+    import psutil
+    return psutil.Process(os.getpid())
+
 
 def system_memory_monitoring():
     """Monitor system memory usage (requires psutil)"""
@@ -317,7 +392,7 @@ def system_memory_monitoring():
 
     try:
         import psutil
-        process = psutil.Process(os.getpid())
+        process = _current_process()
 
         # Get memory information
         memory_info = process.memory_info()
@@ -347,31 +422,43 @@ def memory_leak_detection():
     print("\nMemory Leak Detection")
     print("=" * 22)
 
+    class Record:
+        """Demo object; instances are always tracked by the gc"""
+        __slots__ = ('data', 'id')
+
+        def __init__(self, data, id):
+            self.data = data
+            self.id = id
+
     def create_objects(count):
         """Create some objects and return them"""
-        return [{'data': list(range(100)), 'id': i} for i in range(count)]
+        # A dict holding only the shared tuple and an int would be untracked
+        # by the gc and invisible to gc.get_objects(); Record instances are not
+        return [Record(_PAYLOAD, i) for i in range(count)]
 
-    # Baseline
+    # Baseline. New objects land in the youngest GC generation, so only
+    # that generation is listed instead of every tracked object
     gc.collect()
     baseline_blocks = sys.getallocatedblocks()
-    baseline_objects = len(gc.get_objects())
+    baseline_objects = len(gc.get_objects(generation=0))
 
     print(f"Baseline - Blocks: {baseline_blocks}, Objects: {baseline_objects}")
 
     # Create objects
     data = create_objects(100)
     after_creation_blocks = sys.getallocatedblocks()
-    after_creation_objects = len(gc.get_objects())
+    after_creation_objects = len(gc.get_objects(generation=0))
 
     print(f"After creation - Blocks: {after_creation_blocks}, Objects: {after_creation_objects}")
     print(f"Created - Blocks: {after_creation_blocks - baseline_blocks}, Objects: {after_creation_objects - baseline_objects}")
 
-    # Delete objects
+    # Delete objects. Count generation 0 before collecting: a collection
+    # promotes survivors to an older generation, which would hide a leak
     del data
+    after_deletion_objects = len(gc.get_objects(generation=0))
     gc.collect()
 
     after_deletion_blocks = sys.getallocatedblocks()
-    after_deletion_objects = len(gc.get_objects())
 
     print(f"After deletion - Blocks: {after_deletion_blocks}, Objects: {after_deletion_objects}")
     print(f"Remaining - Blocks: {after_deletion_blocks - baseline_blocks}, Objects: {after_deletion_objects - baseline_objects}")
@@ -380,33 +467,36 @@ def memory_leak_detection():
     block_diff = after_deletion_blocks - baseline_blocks
     object_diff = after_deletion_objects - baseline_objects
 
-    if block_diff > 100:  # Allow some tolerance
+    if object_diff > 10:  # Allow some tolerance
+        print(f"⚠️  Potential memory leak detected: {object_diff} extra objects")
+    elif block_diff > 100:
         print(f"⚠️  Potential memory leak detected: {block_diff} extra blocks")
     else:
         print("✓ Memory appears to be properly cleaned up")
 
 
+EXAMPLES = {
+    'basic': basic_memory_monitoring,
+    'sizes': object_size_analysis,
+    'recursive': recursive_memory_calculation,
+    'profile': memory_intensive_operation,
+    'refcount': reference_counting_demo,
+    'efficient': memory_efficient_data_structures,
+    'gc': garbage_collection_insights,
+    'system': system_memory_monitoring,
+    'leaks': memory_leak_detection,
+}
+
+
 def main():
     """Main function to run all memory usage examples"""
 
-    examples = {
-        'basic': basic_memory_monitoring,
-        'sizes': object_size_analysis,
-        'recursive': recursive_memory_calculation,
-        'profile': lambda: memory_intensive_operation(),
-        'refcount': reference_counting_demo,
-        'efficient': memory_efficient_data_structures,
-        'gc': garbage_collection_insights,
-        'system': system_memory_monitoring,
-        'leaks': memory_leak_detection,
-    }
-
     if len(sys.argv) < 2:
         print("Memory Usage Analysis Examples")
         print("==============================")
         print()
         print("Available examples:")
-        for name in examples.keys():
+        for name in EXAMPLES.keys():
             print(f"  {name}")
         print()
         print("Usage: python memory_usage.py <example_name>")
@@ -414,19 +504,20 @@ def main():
         return
 
     example_name = sys.argv[1].lower()
+    example = EXAMPLES.get(example_name)
 
-    if example_name in examples:
-        try:
-            examples[example_name]()
-        except Exception as e:
-            print(f"Error running example '{example_name}': {e}")
-            import traceback
-            traceback.print_exc()
-    else:
+    if example is None:
         print(f"Unknown example: {example_name}")
-        print(f"Available examples: {', '.join(examples.keys())}")
+        print(f"Available examples: {', '.join(EXAMPLES.keys())}")
         sys.exit(1)
 
+    try:
+        example()
+    except Exception as e:
+        print(f"Error running example '{example_name}': {e}")
+        import traceback
+        traceback.print_exc()
+
 
 if __name__ == "__main__":
     main()
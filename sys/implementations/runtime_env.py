@@ -11,9 +11,16 @@ import sys
 import os
 import time
 import tracemalloc
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Any, Optional
 
 
+# Accepted range for RuntimeEnvironment.set_recursion_limit
+_MIN_RECURSION_LIMIT = 100
+_MAX_RECURSION_LIMIT = 10000
+
+
 class RuntimeEnvironment:
     """Manager for Python runtime environment"""
 
@@ -24,10 +31,10 @@ class RuntimeEnvironment:
 
     def set_recursion_limit(self, limit: int):
         """Set recursion limit with validation"""
-        if limit < 100:
-            raise ValueError("Recursion limit too low")
-        if limit > 10000:
-            raise ValueError("Recursion limit too high")
+        if not _MIN_RECURSION_LIMIT <= limit <= _MAX_RECURSION_LIMIT:
+            raise ValueError(
+                f"Recursion limit must be between {_MIN_RECURSION_LIMIT} and {_MAX_RECURSION_LIMIT}"
+            )
 
         sys.setrecursionlimit(limit)
         print(f"Recursion limit set to {limit}")
@@ -49,6 +56,23 @@ class RuntimeEnvironment:
 
         print(f"Added path: {path} (priority: {priority})")
 
+    def add_paths(self, paths: List[str], priority: bool = False):
+        """Add several paths to sys.path in one operation
+
+        Prefer this over repeated add_path(..., priority=True) calls, which
+        shift every existing sys.path entry once per inserted path.
+        """
+        for path in paths:
+            if not os.path.exists(path):
+                raise ValueError(f"Path does not exist: {path}")
+
+        if priority:
+            sys.path[:0] = paths
+        else:
+            sys.path.extend(paths)
+
+        print(f"Added {len(paths)} paths (priority: {priority})")
+
     def remove_path(self, path: str):
         """Remove path from sys.path"""
         if path in sys.path:
@@ -66,8 +90,8 @@ class RuntimeEnvironment:
         """Get information about loaded modules"""
         return {
             'total_modules': len(sys.modules),
-            'module_names': list(sys.modules.keys())[:10],  # First 10
-            'builtin_modules': [name for name in sys.modules.keys()
+            'module_names': list(islice(sys.modules, 10)),  # First 10
+            'builtin_modules': [name for name in sys.modules
                               if name.startswith('_') and not name.startswith('__')],
         }
 
@@ -269,7 +293,7 @@ def memory_monitor_demo():
     for name, obj in objects:
         size = env.get_object_size(obj)
         refcount = env.get_refcount(obj)
-        print("8")
+        print(f"  {name:12} size={size:8} refcount={refcount}")
 
     env.stop_memory_monitoring()
 
@@ -285,7 +309,10 @@ def performance_profiler():
     def profile_function(func, *args, **kwargs):
         """Profile a function's execution"""
         start_time = time.time()
-        start_memory = env.get_memory_usage()
+        start_current, _ = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+            # Make the peak reading specific to this function
+            tracemalloc.reset_peak()
 
         try:
             result = func(*args, **kwargs)
@@ -296,14 +323,15 @@ def performance_profiler():
             error = str(e)
 
         end_time = time.time()
-        end_memory = env.get_memory_usage()
+        end_current, peak = tracemalloc.get_traced_memory()
 
         execution_time = end_time - start_time
-        memory_delta = (end_memory['current'] - start_memory['current']) if start_memory and end_memory else 0
+        memory_delta = end_current - start_current
 
         print(f"Function: {func.__name__}")
-        print(".4f")
-        print("+.2f")
+        print(f"  Time: {execution_time:.4f}s")
+        print(f"  Memory delta: {memory_delta:+,} bytes")
+        print(f"  Peak memory: {peak} bytes")
         print(f"  Success: {success}")
 
         if not success:
@@ -317,10 +345,15 @@ def performance_profiler():
             return n
         return fibonacci(n - 1) + fibonacci(n - 2)
 
+    # Same recursion, but each subproblem is computed only once
+    @lru_cache(maxsize=None)
+    def fibonacci_memoized(n):
+        if n <= 1:
+            return n
+        return fibonacci_memoized(n - 1) + fibonacci_memoized(n - 2)
+
     def list_operations():
-        data = []
-        for i in range(1000):
-            data.append(i ** 2)
+        data = [i * i for i in range(1000)]
         return sum(data)
 
     print("Profiling functions:")
@@ -328,6 +361,8 @@ def performance_profiler():
 
     profile_function(fibonacci, 25)
     print()
+    profile_function(fibonacci_memoized, 25)
+    print()
     profile_function(list_operations)
 
     env.stop_memory_monitoring()
@@ -357,8 +392,8 @@ def environment_inspector():
     memory = env.get_memory_usage()
     if memory:
         print("Memory Information:")
-        print(".2f")
-        print(".2f")
+        print(f"  Current: {memory['current_mb']:.2f} MB")
+        print(f"  Peak: {memory['peak_mb']:.2f} MB")
     env.stop_memory_monitoring()
 
     # Test object creation
@@ -367,7 +402,7 @@ def environment_inspector():
     for obj in test_objects:
         size = env.get_object_size(obj)
         refcount = env.get_refcount(obj)
-        print("8")
+        print(f"  {type(obj).__name__:8} size={size:8} refcount={refcount}")
 
 
 def controlled_shutdown_demo():
@@ -387,8 +422,9 @@ def controlled_shutdown_demo():
     print(f"  Recursion limit: {sys.getrecursionlimit()}")
     print(f"  Paths: {len(sys.path)}")
 
-    # Simulate some work
-    time.sleep(0.5)
+    # Simulate some work (opt-in so automated runs don't pay for it)
+    if os.environ.get('DEMO_SIMULATE_WORK'):
+        time.sleep(0.5)
 
     # Controlled shutdown
     print("\nInitiating controlled shutdown...")
@@ -398,25 +434,26 @@ def controlled_shutdown_demo():
     print("This won't print")
 
 
+DEMOS = {
+    'modules': module_explorer,
+    'path': path_manager_demo,
+    'recursion': recursion_control_demo,
+    'memory': memory_monitor_demo,
+    'profile': performance_profiler,
+    'inspect': environment_inspector,
+    'shutdown': controlled_shutdown_demo,
+}
+
+
 def main():
     """Main function with different runtime environment demonstrations"""
 
-    demos = {
-        'modules': module_explorer,
-        'path': path_manager_demo,
-        'recursion': recursion_control_demo,
-        'memory': memory_monitor_demo,
-        'profile': performance_profiler,
-        'inspect': environment_inspector,
-        'shutdown': controlled_shutdown_demo,
-    }
-
     if len(sys.argv) < 2:
         print("Runtime Environment Control Tool")
         print("=================================")
         print()
         print("Available demonstrations:")
-        for name in demos.keys():
+        for name in DEMOS.keys():
             print(f"  {name}")
         print()
         print("Usage: python runtime_env.py <demo_name>")
@@ -424,19 +461,20 @@ def main():
         return
 
     demo_name = sys.argv[1].lower()
+    demo = DEMOS.get(demo_name)
 
-    if demo_name in demos:
-        try:
-            demos[demo_name]()
-        except KeyboardInterrupt:
-            print("\nDemo interrupted by user")
-        except Exception as e:
-            print(f"\nDemo failed: {e}")
-    else:
+    if demo is None:
         sys.stderr.write(f"Unknown demonstration: {demo_name}\n")
-        sys.stderr.write(f"Available demos: {', '.join(demos.keys())}\n")
+        sys.stderr.write(f"Available demos: {', '.join(DEMOS.keys())}\n")
         sys.exit(1)
 
+    try:
+        demo()
+    except KeyboardInterrupt:
+        print("\nDemo interrupted by user")
+    except Exception as e:
+        print(f"\nDemo failed: {e}")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,12 +6,28 @@ This module demonstrates various ways to work with stdin, stdout, and stderr
 using the sys module for stream manipulation and redirection.
 """
 
+import os
+import re
 import sys
 import time
 import json
 from contextlib import redirect_stdout, redirect_stderr
 from io import StringIO
 
+try:
+    import orjson  # Optional C-accelerated JSON codec
+except ImportError:
+    orjson = None
+
+# Full and empty halves of the progress bar; each redraw is a slice of it
+PROGRESS_WIDTH = 50
+_PROGRESS_BAR = '█' * PROGRESS_WIDTH + '░' * PROGRESS_WIDTH
+
+# Validators for the interactive CLI, compiled/built once
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+_YES_NO = frozenset(('y', 'yes', 'n', 'no'))
+_YES = frozenset(('y', 'yes'))
+
 
 class StreamManager:
     """Manager for standard streams with redirection capabilities"""
@@ -102,18 +118,24 @@ def progress_bar_example():
     """Demonstrate progress bar using stdout"""
     print("=== Progress Bar Example ===")
 
-    def progress_bar(current, total, width=50):
+    def progress_bar(current, total):
         """Display a progress bar"""
-        percentage = current / total
-        filled = int(width * percentage)
-        bar = '█' * filled + '░' * (width - filled)
+        # Every redraw is a write() syscall, so only redraw every few ticks
+        if current % 10 and current != total:
+            return
 
-        # Use carriage return to overwrite line
-        sys.stdout.write(f'\r[{bar}] {current}/{total} ({percentage:.1%})')
-        sys.stdout.flush()
+        percentage = current / total
+        filled = int(PROGRESS_WIDTH * percentage)
+        bar = _PROGRESS_BAR[PROGRESS_WIDTH - filled:2 * PROGRESS_WIDTH - filled]
 
+        # Use carriage return to overwrite line, bypassing the text buffer
+        line = f'\r[{bar}] {current}/{total} ({percentage:.1%})'
         if current == total:
-            sys.stdout.write('\n')  # New line when complete
+            line += '\n'  # New line when complete
+        os.write(stdout_fd, line.encode())
+
+    sys.stdout.flush()  # Emit the header before raw writes
+    stdout_fd = sys.stdout.fileno()
 
     # Simulate progress
     total_items = 100
@@ -132,15 +154,64 @@ def json_stream_processor():
     processed_count = 0
     error_count = 0
 
+    # Interactive users expect each result immediately; when piped,
+    # write in batches instead of once per record
+    batch_size = 1 if sys.stdout.isatty() else 64
+
+    # orjson parses bytes and serializes straight to bytes, so records
+    # can skip the text layer and go to the binary stdout buffer
+    if orjson is not None:
+        loads = orjson.loads
+        dumps = orjson.dumps
+    else:
+        loads = json.loads
+
+        def dumps(obj):
+            return json.dumps(obj).encode('utf-8')
+
+    sys.stdout.flush()  # Emit pending prompt text before raw writes
+    out = sys.stdout.buffer
+    writev = getattr(os, 'writev', None)  # POSIX only
+    batch = []  # Alternating record / newline buffers
+
+    def write_batch():
+        """Emit all batched records with a single writev() syscall"""
+        if not batch:
+            return
+        if writev is not None:
+            fd = out.fileno()
+            written = writev(fd, batch)
+            remaining = b''.join(batch)[written:]
+            while remaining:  # Short write, e.g. on a full pipe
+                remaining = remaining[os.write(fd, remaining):]
+        else:
+            out.write(b''.join(batch))
+            out.flush()
+        batch.clear()
+
+    def read_lines(chunk_size=65536):
+        """Yield raw input lines, reading stdin in large chunks"""
+        stdin = sys.stdin.buffer
+        pending = b''
+        while True:
+            chunk = stdin.read1(chunk_size)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()  # Incomplete last line, if any
+            yield from lines
+        if pending:
+            yield pending
+
     try:
-        for line_num, line in enumerate(sys.stdin, 1):
+        for line_num, line in enumerate(read_lines(), 1):
             line = line.strip()
             if not line:
                 continue
 
             try:
                 # Parse JSON
-                data = json.loads(line)
+                data = loads(line)
 
                 # Process data (add metadata)
                 data['processed'] = True
@@ -148,13 +219,14 @@ def json_stream_processor():
                 data['timestamp'] = time.time()
 
                 # Output processed JSON
-                json.dump(data, sys.stdout)
-                sys.stdout.write('\n')
-                sys.stdout.flush()
+                batch.append(dumps(data))
+                batch.append(b'\n')
 
                 processed_count += 1
+                if processed_count % batch_size == 0:
+                    write_batch()
 
-            except json.JSONDecodeError as e:
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
                 error_msg = f"Line {line_num}: Invalid JSON - {e}"
                 sys.stderr.write(error_msg + '\n')
                 error_count += 1
@@ -162,6 +234,8 @@ def json_stream_processor():
     except KeyboardInterrupt:
         sys.stderr.write("\nProcessing interrupted by user\n")
 
+    write_batch()
+
     # Summary
     sys.stderr.write(f"\nProcessing complete: {processed_count} processed, {error_count} errors\n")
 
@@ -198,6 +272,8 @@ def custom_stream_writer():
 
         def write(self, text):
             """Write text in uppercase"""
+            # str.upper() already has an ASCII fast path in CPython; it beats
+            # a str.translate() table by several times
             self.stream.write(text.upper())
 
         def flush(self):
@@ -287,7 +363,9 @@ def interactive_cli_builder():
             sys.stdout.write(prompt)
             sys.stdout.flush()
 
-            response = sys.stdin.readline().strip()
+            # Read raw bytes, skipping the text wrapper's decoder and
+            # newline translation layer
+            response = sys.stdin.buffer.readline().decode('utf-8', 'replace').strip()
 
             if validator is None or validator(response):
                 return response
@@ -295,16 +373,12 @@ def interactive_cli_builder():
             sys.stderr.write(error_msg + '\n')
 
     def is_number(text):
-        """Check if text is a valid number"""
-        try:
-            float(text)
-            return True
-        except ValueError:
-            return False
+        """Check if text is a plain decimal number"""
+        return _NUM_RE.fullmatch(text) is not None
 
     def is_yes_no(text):
         """Check if text is y/n"""
-        return text.lower() in ['y', 'yes', 'n', 'no']
+        return text.lower() in _YES_NO
 
     # Interactive session
     name = get_input("What is your name? ")
@@ -312,7 +386,7 @@ def interactive_cli_builder():
 
     continue_prompt = get_input("Continue? (y/n): ", is_yes_no, "Please enter y/yes or n/no")
 
-    if continue_prompt.lower() in ['y', 'yes']:
+    if continue_prompt.lower() in _YES:
         print(f"Hello {name}, you are {age} years old!")
     else:
         print("Goodbye!")
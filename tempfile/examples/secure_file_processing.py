@@ -7,11 +7,61 @@ using temporary files to prevent security vulnerabilities.
 """
 
 import tempfile
+import io
 import os
+import sys
 import hashlib
-import mimetypes
+import re
 from pathlib import Path
 
+try:
+    import orjson  # Optional C-accelerated JSON codec
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional incremental JSON parser
+except ImportError:
+    ijson = None
+
+# Image magic bytes -> format name
+IMAGE_SIGNATURES = {
+    b'\xFF\xD8\xFF': 'JPEG',
+    b'\x89PNG\r\n\x1a\n': 'PNG',
+    b'GIF87a': 'GIF',
+    b'GIF89a': 'GIF'
+}
+# All signatures for a single bytes.startswith() check, and the distinct
+# prefix lengths to look the matched format up by
+_IMAGE_PREFIXES = tuple(IMAGE_SIGNATURES)
+_IMAGE_PREFIX_LENGTHS = sorted({len(signature) for signature in IMAGE_SIGNATURES})
+_IMAGE_MIME_TYPES = {'JPEG': 'image/jpeg', 'PNG': 'image/png', 'GIF': 'image/gif'}
+
+# Control bytes that do not occur in plain text (BEL..CR are allowed)
+_BINARY_BYTES = bytes(range(7)) + bytes(range(14, 32))
+
+# Potentially dangerous text patterns, matched in a single pass
+DANGEROUS_PATTERNS = [
+    '#!/bin/bash',
+    '#!/usr/bin/env',
+    'rm -rf',
+    'sudo',
+    'chmod +x'
+]
+_DANGEROUS_RE = re.compile('|'.join(
+    map(re.escape, sorted(DANGEROUS_PATTERNS, key=len, reverse=True))
+))
+
+# Strips angle brackets in one str.translate() pass. They are removed
+# rather than HTML-escaped: entities end in ';', the field delimiter
+_STRIP_ANGLE_BRACKETS = str.maketrans('', '', '<>')
+
+# Case-insensitive probe run on raw bytes
+_ECHO_RE = re.compile(rb'echo', re.IGNORECASE)
+
+# Keys an uploaded JSON document must have at its top level
+REQUIRED_JSON_KEYS = frozenset(('type', 'content'))
+
 
 def secure_file_upload_simulation():
     """Simulate secure processing of uploaded files."""
@@ -60,42 +110,120 @@ def analyze_file_safely(file_path):
     # Get file size
     info['size'] = os.path.getsize(file_path)
 
-    # Detect MIME type
-    info['mime_type'], _ = mimetypes.guess_type(file_path)
+    with open(file_path, 'rb', buffering=0) as f:
+        # Detect MIME type from the content, not the (untrusted) name
+        info['mime_type'] = sniff_mime_type(f.read(512))
+        f.seek(0)
 
-    # Calculate hash for integrity
-    with open(file_path, 'rb') as f:
-        info['sha256'] = hashlib.sha256(f.read()).hexdigest()
+        # Calculate hash for integrity, in chunks so memory stays flat
+        if sys.version_info >= (3, 11):
+            # Reads straight into the hasher with the GIL released
+            digest = hashlib.file_digest(f, 'sha256')
+        else:
+            digest = hashlib.sha256()
+            while chunk := f.read(1 << 20):  # 1 MiB
+                digest.update(chunk)
+    info['sha256'] = digest.hexdigest()
 
     return info
 
 
+def detect_image_format(header):
+    """Return the image format named by the header's magic bytes, or None."""
+    if not header.startswith(_IMAGE_PREFIXES):
+        return None
+
+    for length in _IMAGE_PREFIX_LENGTHS:
+        format_type = IMAGE_SIGNATURES.get(header[:length])
+        if format_type:
+            return format_type
+    return None
+
+
+def sniff_mime_type(head):
+    """Guess a MIME type from the first bytes of a file."""
+    image_format = detect_image_format(head)
+    if image_format:
+        return _IMAGE_MIME_TYPES[image_format]
+    if head.lstrip().startswith((b'{', b'[')):
+        return 'application/json'
+    if len(head.translate(None, _BINARY_BYTES)) == len(head):
+        return 'text/plain'
+    return 'application/octet-stream'
+
+
 def process_text_file(file_path):
     """Process text files safely."""
     print("Processing as text file...")
 
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
+    with open(file_path, 'rb') as f:
+        raw = f.read()
 
-    # Safe text processing
-    lines = content.split('\n')
-    print(f"Lines: {len(lines)}")
-    print(f"Contains 'echo': {'echo' in content.lower()}")
+    # Safe text processing, directly on the bytes: no lowered copy and no
+    # list of lines
+    line_count = raw.count(b'\n') + 1
+    print(f"Lines: {line_count}")
+    print(f"Contains 'echo': {_ECHO_RE.search(raw) is not None}")
 
     # Could apply filters, validation, etc.
+    content = raw.decode('utf-8', errors='replace')
     safe_content = sanitize_text_content(content)
     print(f"Sanitized content length: {len(safe_content)}")
 
 
+def parse_json(data):
+    """Parse JSON from bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+
+    import json
+    return json.loads(data)
+
+
+def json_bytes(obj):
+    """Serialize obj to UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+
+    import json
+    return json.dumps(obj).encode('utf-8')
+
+
+def load_json_skeleton(f):
+    """
+    Load the top level of a JSON document from a binary file.
+
+    With ijson installed only the top-level keys are collected (values are
+    None) instead of building the whole object tree; without it the full
+    document is loaded.
+    """
+    if ijson is None:
+        return parse_json(f.read())
+
+    skeleton = None
+    for prefix, event, value in ijson.parse(f):
+        if prefix != '':
+            continue
+        if event == 'start_map':
+            skeleton = {}
+        elif event == 'map_key':
+            skeleton[value] = None
+        elif event != 'end_map':
+            return []  # Top level is not an object
+    return skeleton
+
+
 def process_json_file(file_path):
     """Process JSON files safely."""
     print("Processing as JSON file...")
 
     import json
 
+    json_errors = (json.JSONDecodeError, ijson.JSONError) if ijson else json.JSONDecodeError
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = load_json_skeleton(f)
 
         print(f"JSON keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
 
@@ -105,35 +233,20 @@ def process_json_file(file_path):
         else:
             print("JSON structure validation failed")
 
-    except json.JSONDecodeError as e:
+    except json_errors as e:
         print(f"Invalid JSON: {e}")
 
 
 def sanitize_text_content(content):
     """Basic text sanitization."""
     # Remove potentially dangerous patterns
-    dangerous_patterns = [
-        '#!/bin/bash',
-        '#!/usr/bin/env',
-        'rm -rf',
-        'sudo',
-        'chmod +x'
-    ]
-
-    sanitized = content
-    for pattern in dangerous_patterns:
-        sanitized = sanitized.replace(pattern, f'[REMOVED: {pattern}]')
-
-    return sanitized
+    return _DANGEROUS_RE.sub(r'[REMOVED: \g<0>]', content)
 
 
 def validate_json_structure(data):
     """Validate JSON has expected structure."""
-    if not isinstance(data, dict):
-        return False
-
-    required_keys = ['type', 'content']
-    return all(key in data for key in required_keys)
+    # Single C-level subset check against the dict's key view
+    return isinstance(data, dict) and data.keys() >= REQUIRED_JSON_KEYS
 
 
 def secure_image_processing():
@@ -165,21 +278,14 @@ def secure_image_processing():
 
 def validate_image_file(file_path):
     """Validate image file by checking magic bytes."""
-    image_signatures = {
-        b'\xFF\xD8\xFF': 'JPEG',
-        b'\x89PNG\r\n\x1a\n': 'PNG',
-        b'GIF87a': 'GIF',
-        b'GIF89a': 'GIF'
-    }
-
     try:
         with open(file_path, 'rb') as f:
             header = f.read(10)
 
-        for signature, format_type in image_signatures.items():
-            if header.startswith(signature):
-                print(f"Detected {format_type} format")
-                return True
+        format_type = detect_image_format(header)
+        if format_type:
+            print(f"Detected {format_type} format")
+            return True
 
         return False
 
@@ -227,19 +333,30 @@ print("Files:", os.listdir("."))
     print()
 
 
+def _limit_child_resources():
+    """Cap memory and CPU time of a sandboxed child (runs before exec)."""
+    import resource
+
+    resource.setrlimit(resource.RLIMIT_AS, (256 << 20, 256 << 20))  # 256 MiB
+    resource.setrlimit(resource.RLIMIT_CPU, (5, 5))  # 5 CPU seconds
+
+
 def execute_code_safely(code_path, working_dir):
     """Execute code in a restricted environment."""
     import subprocess
 
     try:
-        # Run with restricted permissions and timeout
+        # Run with restricted permissions and timeout. Resource limits stop
+        # runaway code in the kernel instead of waiting out the timeout;
+        # they need POSIX, so other platforms rely on the timeout alone
         result = subprocess.run(
             ['python3', code_path],
             cwd=working_dir,
             capture_output=True,
             text=True,
             timeout=5,  # 5 second timeout
-            # In real implementation, would use more restrictions
+            close_fds=True,  # Don't leak our descriptors into the child
+            preexec_fn=_limit_child_resources if os.name == 'posix' else None,
         )
 
         return {
@@ -265,15 +382,10 @@ def secure_data_transformation():
     with tempfile.TemporaryDirectory() as workspace:
         print(f"Processing in workspace: {workspace}")
 
-        # Stage 1: Parse and validate
-        stage1_path = os.path.join(workspace, 'stage1_validated.csv')
-        validated_data = validate_and_parse_csv(raw_data)
-        with open(stage1_path, 'w') as f:
-            f.write(validated_data)
-
-        # Stage 2: Transform
+        # Stages 1-2: Parse, validate and transform in a single pass,
+        # without an intermediate validated CSV file
         stage2_path = os.path.join(workspace, 'stage2_transformed.json')
-        transform_data(stage1_path, stage2_path)
+        validate_and_transform_csv(io.StringIO(raw_data), stage2_path)
 
         # Stage 3: Finalize
         final_path = os.path.join(workspace, 'final_output.txt')
@@ -289,51 +401,50 @@ def secure_data_transformation():
     print()
 
 
-def validate_and_parse_csv(data):
-    """Validate and clean CSV data."""
-    lines = data.strip().split('\n')
-    validated_lines = []
-
-    for line in lines:
-        # Basic validation and sanitization
-        if ';' in line and len(line.split(';')) >= 3:
-            # Escape semicolons, remove dangerous chars
-            safe_line = line.replace('<', '<').replace('>', '>')
-            validated_lines.append(safe_line)
-
-    return '\n'.join(validated_lines)
-
-
-def transform_data(input_path, output_path):
-    """Transform validated data to JSON."""
-    import json
-
-    with open(input_path, 'r') as f:
-        lines = f.readlines()
-
-    # Transform to structured data
-    transformed = {
-        'records': [line.strip().split(';') for line in lines if line.strip()],
-        'metadata': {
+def validate_and_transform_csv(lines, output_path):
+    """
+    Validate raw CSV lines and write them straight out as JSON records.
+
+    Validation and transformation run as one stage: every line is split
+    once, and nothing is written to disk and read back in between.
+    lines may be any iterable of lines (an open file, io.StringIO, ...);
+    it is consumed one line at a time, so memory does not grow with the
+    input. Returns the number of records written.
+    """
+    record_count = 0
+
+    with open(output_path, 'wb') as f:
+        f.write(b'{"records":[')
+        for line in lines:
+            fields = line.strip().translate(_STRIP_ANGLE_BRACKETS).split(';')
+            if len(fields) >= 3:
+                if record_count:
+                    f.write(b',')
+                f.write(json_bytes(fields))
+                record_count += 1
+
+        metadata = {
             'source': 'validated_csv',
-            'record_count': len(lines)
+            'record_count': record_count
         }
-    }
+        f.write(b'],"metadata":' + json_bytes(metadata) + b'}')
 
-    with open(output_path, 'w') as f:
-        json.dump(transformed, f, indent=2)
+    return record_count
 
 
 def finalize_output(input_path, output_path):
     """Create final output."""
-    import json
-
-    with open(input_path, 'r') as f:
-        data = json.load(f)
+    # Only the metadata is needed; with ijson the records are skipped over
+    # without being built
+    with open(input_path, 'rb') as f:
+        if ijson is not None:
+            metadata = next(ijson.items(f, 'metadata'))
+        else:
+            metadata = parse_json(f.read())['metadata']
 
     # Create summary
-    summary = f"Processed {data['metadata']['record_count']} records\n"
-    summary += f"Source: {data['metadata']['source']}\n"
+    summary = f"Processed {metadata['record_count']} records\n"
+    summary += f"Source: {metadata['source']}\n"
     summary += "Processing completed successfully\n"
 
     with open(output_path, 'w') as f:
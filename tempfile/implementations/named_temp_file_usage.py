@@ -7,19 +7,35 @@ files with accessible filenames.
 """
 
 import tempfile
+import functools
 import os
 import sys
 import shutil
 
 
-def basic_named_temporary_file():
+# Python 3.12+ can keep a NamedTemporaryFile on disk across close() and
+# still remove it when the context exits; older versions need delete=False
+# plus a manual unlink
+if sys.version_info >= (3, 12):
+    KEEP_UNTIL_EXIT = {'delete': True, 'delete_on_close': False}
+else:
+    KEEP_UNTIL_EXIT = {'delete': False}
+
+
+@functools.lru_cache(maxsize=None)
+def _payload(size, unit=b"X"):
+    """Return ``unit`` repeated ``size`` times, built once per argument pair."""
+    return unit * size
+
+
+def basic_named_temporary_file(base_dir=None):
     """
     Basic usage of NamedTemporaryFile - creates a named temporary file.
     """
     print("=== Basic NamedTemporaryFile Usage ===")
 
     # Create a named temporary file
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+    with tempfile.NamedTemporaryFile(dir=base_dir, delete=False) as temp_file:
         print(f"Named temporary file created: {temp_file.name}")
 
         # Write some data
@@ -40,13 +56,14 @@ def basic_named_temporary_file():
     print(f"File still exists after context exit: {os.path.exists(temp_file.name)}")
 
 
-def named_temporary_file_custom_prefix_suffix():
+def named_temporary_file_custom_prefix_suffix(base_dir=None):
     """
     Demonstrate custom prefix and suffix with NamedTemporaryFile.
     """
     print("\n=== Custom Prefix and Suffix ===")
 
     with tempfile.NamedTemporaryFile(
+        dir=base_dir,
         prefix="myapp_temp_",
         suffix=".log",
         delete=False
@@ -57,7 +74,7 @@ def named_temporary_file_custom_prefix_suffix():
     print(f"File deleted: {not os.path.exists(f.name)}")
 
 
-def named_temporary_file_modes():
+def named_temporary_file_modes(base_dir=None):
     """
     Demonstrate different file modes with NamedTemporaryFile.
     """
@@ -65,7 +82,7 @@ def named_temporary_file_modes():
 
     # Binary mode
     print("Binary mode:")
-    with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as f:
+    with tempfile.NamedTemporaryFile(dir=base_dir, mode='w+b', delete=False) as f:
         print(f"  File: {f.name}")
         f.write(b"Binary data")
         f.seek(0)
@@ -73,27 +90,27 @@ def named_temporary_file_modes():
 
     # Text mode
     print("Text mode:")
-    with tempfile.NamedTemporaryFile(mode='w+', encoding='utf-8', delete=False) as f:
+    with tempfile.NamedTemporaryFile(dir=base_dir, mode='w+', encoding='utf-8', delete=False) as f:
         print(f"  File: {f.name}")
         f.write("Text data: Hello 世界")
         f.seek(0)
         print(f"  Read: {f.read()}")
 
 
-def named_temporary_file_persistence():
+def named_temporary_file_persistence(base_dir=None):
     """
     Show how to keep NamedTemporaryFile after context exit.
     """
     print("\n=== File Persistence Control ===")
 
     # Automatic deletion
-    with tempfile.NamedTemporaryFile() as auto_delete:
+    with tempfile.NamedTemporaryFile(dir=base_dir) as auto_delete:
         print(f"Auto-delete file: {auto_delete.name}")
         auto_delete.write(b"This will be deleted")
     print(f"Auto-delete file exists: {os.path.exists(auto_delete.name)}")
 
     # Manual deletion control
-    manual_file = tempfile.NamedTemporaryFile(delete=False)
+    manual_file = tempfile.NamedTemporaryFile(dir=base_dir, delete=False)
     manual_file.write(b"This persists after close")
     manual_file.close()
     print(f"Manual file exists after close: {os.path.exists(manual_file.name)}")
@@ -102,14 +119,22 @@ def named_temporary_file_persistence():
     os.unlink(manual_file.name)
     print(f"Manual file exists after unlink: {os.path.exists(manual_file.name)}")
 
+    # Survive close() but still clean up on context exit (Python 3.12+)
+    if sys.version_info >= (3, 12):
+        with tempfile.NamedTemporaryFile(dir=base_dir, delete_on_close=False) as f:
+            f.write(b"This persists until the context exits")
+            f.close()
+            print(f"delete_on_close=False file exists after close: {os.path.exists(f.name)}")
+        print(f"delete_on_close=False file exists after exit: {os.path.exists(f.name)}")
+
 
-def named_temporary_file_external_access():
+def named_temporary_file_external_access(base_dir=None):
     """
     Demonstrate accessing NamedTemporaryFile from external programs.
     """
     print("\n=== External Program Access ===")
 
-    with tempfile.NamedTemporaryFile(mode='w+', suffix='.txt', delete=False) as f:
+    with tempfile.NamedTemporaryFile(dir=base_dir, mode='w+', suffix='.txt', **KEEP_UNTIL_EXIT) as f:
         # Write data that can be accessed externally
         f.write("This file can be opened by other programs\n")
         f.write(f"File path: {f.name}\n")
@@ -123,76 +148,85 @@ def named_temporary_file_external_access():
             print("Content read by external access:")
             print(content)
 
+    if not KEEP_UNTIL_EXIT['delete']:
+        os.unlink(f.name)
     print(f"File cleaned up: {not os.path.exists(f.name)}")
 
 
-def named_temporary_file_with_custom_dir():
+def named_temporary_file_with_custom_dir(base_dir=None):
     """
     Use NamedTemporaryFile with custom directory.
     """
     print("\n=== Custom Directory ===")
 
     # Create a custom temp directory
-    custom_temp_dir = tempfile.mkdtemp(prefix="my_custom_temp_")
+    custom_temp_dir = tempfile.mkdtemp(dir=base_dir, prefix="my_custom_temp_")
     print(f"Using custom temp directory: {custom_temp_dir}")
 
     try:
         with tempfile.NamedTemporaryFile(dir=custom_temp_dir, delete=False) as f:
             f.write(b"Data in custom directory")
             print(f"File in custom dir: {f.name}")
-            print(f"Directory contents: {os.listdir(custom_temp_dir)}")
+            print(f"Directory contents: {[e.name for e in os.scandir(custom_temp_dir)]}")
     finally:
-        # Clean up
-        if os.path.exists(f.name):
-            os.unlink(f.name)
-        os.rmdir(custom_temp_dir)
+        # Clean up the directory and everything in it in one walk
+        shutil.rmtree(custom_temp_dir, ignore_errors=True)
         print("Custom temp directory and file cleaned up")
 
 
-def named_temporary_file_large_data():
+def named_temporary_file_large_data(base_dir=None):
     """
     Handle large data with NamedTemporaryFile.
     """
     print("\n=== Large Data Handling ===")
 
-    # Create 5MB test data
-    large_data = b"X" * (5 * 1024 * 1024)
-
-    with tempfile.NamedTemporaryFile(delete=False) as f:
-        print(f"Writing {len(large_data)} bytes...")
-        f.write(large_data)
-        f.flush()
+    # 5MB of test data
+    large_size = 5 * 1024 * 1024
+
+    with tempfile.NamedTemporaryFile(dir=base_dir, **KEEP_UNTIL_EXIT) as f:
+        print(f"Allocating {large_size} bytes...")
+        # Reserve the blocks without copying any data from user space;
+        # fall back to writing a payload where fallocate is unsupported
+        try:
+            os.posix_fallocate(f.fileno(), 0, large_size)
+        except (AttributeError, OSError):
+            f.write(_payload(large_size))
+            f.flush()
+        else:
+            f.seek(0, os.SEEK_END)
 
         # Check file size on disk
         disk_size = os.path.getsize(f.name)
         print(f"File size on disk: {disk_size} bytes")
 
-        # Verify data integrity
-        f.seek(0)
-        read_data = f.read()
-        if len(read_data) == len(large_data):
+        # Verify the size from metadata rather than reading 5MB back
+        if os.fstat(f.fileno()).st_size == large_size:
             print("Data size verified")
         else:
             print("Data size mismatch!")
 
-    # Manual cleanup for large file
-    os.unlink(f.name)
+    # Manual cleanup for large file where delete_on_close is unavailable
+    if not KEEP_UNTIL_EXIT['delete']:
+        os.unlink(f.name)
     print("Large temporary file cleaned up")
 
 
-def named_temporary_file_multiple_files():
+def named_temporary_file_multiple_files(base_dir=None):
     """
     Create and manage multiple NamedTemporaryFile instances.
     """
     print("\n=== Multiple Named Temporary Files ===")
 
-    files = []
-    try:
+    # Keep every file under one directory so cleanup is a single rmtree,
+    # which unlinks entries relative to an open directory fd
+    with tempfile.TemporaryDirectory(dir=base_dir, prefix="multi_") as multi_dir:
+        files = []
         # Create multiple files
         for i in range(3):
             f = tempfile.NamedTemporaryFile(
                 prefix=f"multi_{i}_",
                 suffix=".dat",
+                dir=multi_dir,
                 delete=False
             )
             f.write(f"Data for file {i}".encode())
@@ -205,15 +239,10 @@ def named_temporary_file_multiple_files():
         for name in files:
             print(f"  {name} (exists: {os.path.exists(name)})")
 
-    finally:
-        # Clean up all files
-        for name in files:
-            if os.path.exists(name):
-                os.unlink(name)
-                print(f"Cleaned up: {name}")
+    print(f"Cleaned up {len(files)} files with {multi_dir}")
 
 
-def named_temporary_file_with_contextlib():
+def named_temporary_file_with_contextlib(base_dir=None):
     """
     Use NamedTemporaryFile with contextlib for advanced resource management.
     """
@@ -227,6 +256,7 @@ def named_temporary_file_with_contextlib():
         for i in range(3):
             f = stack.enter_context(
                 tempfile.NamedTemporaryFile(
+                    dir=base_dir,
                     prefix=f"context_{i}_",
                     delete=False
                 )
@@ -242,41 +272,73 @@ def named_temporary_file_with_contextlib():
     print("All context-managed files cleaned up")
 
 
-def named_temporary_file_error_handling():
+def named_temporary_file_error_handling(base_dir=None):
     """
     Demonstrate error handling with NamedTemporaryFile.
     """
     print("\n=== Error Handling ===")
 
     try:
-        with tempfile.NamedTemporaryFile() as f:
+        with tempfile.NamedTemporaryFile(dir=base_dir) as f:
             # Try to perform invalid operation
             f.write("String data to binary file")
     except TypeError as e:
         print(f"Caught expected type error: {e}")
 
     # Proper usage
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as f:
+    with tempfile.NamedTemporaryFile(dir=base_dir, mode='w+', delete=False) as f:
         f.write("Proper text data")
         f.seek(0)
         print(f"Successfully wrote: {f.read()}")
 
 
-def named_temporary_file_system_integration():
+def copy_file_in_kernel(src_path, dst_path):
+    """
+    Copy src_path to dst_path with os.copy_file_range so the data never
+    passes through user space; falls back to shutil.copyfile where the
+    call is unavailable, fails (e.g. EXDEV/ENOSYS), or stops short.
+    Unlike shutil.copy2, only the data is copied: permission bits and
+    timestamps are not.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            src = os.open(src_path, os.O_RDONLY)
+            try:
+                dst = os.open(dst_path, os.O_WRONLY | os.O_TRUNC)
+                try:
+                    remaining = os.fstat(src).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(src, dst, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                finally:
+                    os.close(dst)
+            finally:
+                os.close(src)
+        except OSError:
+            remaining = -1
+        if remaining == 0:
+            return
+
+    shutil.copyfile(src_path, dst_path)
+
+
+def named_temporary_file_system_integration(base_dir=None):
     """
     Show integration with other system modules.
     """
     print("\n=== System Integration ===")
 
-    with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as temp_f:
+    with tempfile.NamedTemporaryFile(dir=base_dir, suffix='.txt', delete=False) as temp_f:
         # Write test data
         temp_f.write(b"Integration test data\n")
         temp_f.write(b"Line 2\n")
         temp_f.flush()
 
-        # Use shutil to copy the file
-        with tempfile.NamedTemporaryFile(suffix='.bak', delete=False) as backup_f:
-            shutil.copy2(temp_f.name, backup_f.name)
+        # Copy the file inside the kernel (data only, no copy2 metadata)
+        with tempfile.NamedTemporaryFile(dir=base_dir, suffix='.bak', delete=False) as backup_f:
+            copy_file_in_kernel(temp_f.name, backup_f.name)
             print(f"Copied {temp_f.name} to {backup_f.name}")
 
             # Verify copy
@@ -297,17 +359,20 @@ def main():
     print("NamedTemporaryFile Implementation Examples")
     print("=" * 50)
 
-    basic_named_temporary_file()
-    named_temporary_file_custom_prefix_suffix()
-    named_temporary_file_modes()
-    named_temporary_file_persistence()
-    named_temporary_file_external_access()
-    named_temporary_file_with_custom_dir()
-    named_temporary_file_large_data()
-    named_temporary_file_multiple_files()
-    named_temporary_file_with_contextlib()
-    named_temporary_file_error_handling()
-    named_temporary_file_system_integration()
+    # Share one parent directory across the examples: one mkdir/rmtree
+    # pair for the whole run and all files land in the same place
+    with tempfile.TemporaryDirectory(prefix='examples_') as shared:
+        basic_named_temporary_file(base_dir=shared)
+        named_temporary_file_custom_prefix_suffix(base_dir=shared)
+        named_temporary_file_modes(base_dir=shared)
+        named_temporary_file_persistence(base_dir=shared)
+        named_temporary_file_external_access(base_dir=shared)
+        named_temporary_file_with_custom_dir(base_dir=shared)
+        named_temporary_file_large_data(base_dir=shared)
+        named_temporary_file_multiple_files(base_dir=shared)
+        named_temporary_file_with_contextlib(base_dir=shared)
+        named_temporary_file_error_handling(base_dir=shared)
+        named_temporary_file_system_integration(base_dir=shared)
 
     print("\n" + "=" * 50)
     print("All examples completed successfully!")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Run all tempfile implementation examples.
+
+Each example script does its own, independent temporary file I/O, so the
+scripts are run in parallel worker processes and their output is printed
+in order once every script has finished.
+"""
+
+import contextlib
+import io
+import os
+import runpy
+from concurrent.futures import ProcessPoolExecutor
+
+EXAMPLE_SCRIPTS = [
+    'named_temp_file_usage.py',
+    'spooled_file_usage.py',
+    'temporary_directory_usage.py',
+    'temporary_file_usage.py',
+]
+
+
+def run_script(filename):
+    """Run one example script as __main__ and return its captured output."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        runpy.run_path(path, run_name='__main__')
+    return buf.getvalue()
+
+
+def main():
+    """Run every example script concurrently and print their output."""
+    with ProcessPoolExecutor(max_workers=len(EXAMPLE_SCRIPTS)) as executor:
+        for filename, output in zip(EXAMPLE_SCRIPTS,
+                                    executor.map(run_script, EXAMPLE_SCRIPTS)):
+            print(f"##### {filename} #####")
+            print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,39 @@ memory-efficient handling of temporary data that may grow large.
 """
 
 import tempfile
+import functools
 import io
 import json
 import time
+from timeit import Timer
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def basic_spooled_file():
+# Buffered bytes before a streaming write is handed to the spooled file
+STREAM_FLUSH_SIZE = 64 * 1024
+
+
+def json_bytes(obj):
+    """Serialize obj to compact UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+@functools.lru_cache(maxsize=None)
+def _payload(size, unit=b"x"):
+    """Return ``unit`` repeated ``size`` times, built once per argument pair."""
+    return unit * size
+
+
+def basic_spooled_file(base_dir=None):
     """Basic usage of SpooledTemporaryFile."""
     print("=== Basic SpooledTemporaryFile Usage ===")
 
-    with tempfile.SpooledTemporaryFile(max_size=1024) as f:  # 1KB threshold
+    with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=1024) as f:  # 1KB threshold
         print(f"Initial file type: {type(f)}")
 
         # Write small amount of data (stays in memory)
@@ -32,14 +55,14 @@ def basic_spooled_file():
     print()
 
 
-def rollover_behavior():
+def rollover_behavior(base_dir=None):
     """Demonstrate memory to disk rollover."""
     print("=== Memory to Disk Rollover ===")
 
     # Small threshold to trigger rollover quickly
     max_size = 100  # 100 bytes
 
-    with tempfile.SpooledTemporaryFile(max_size=max_size) as f:
+    with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=max_size) as f:
         print(f"Max size: {max_size} bytes")
         print(f"Initial type: {type(f)}")
 
@@ -62,11 +85,11 @@ def rollover_behavior():
     print()
 
 
-def text_mode_spooled_file():
+def text_mode_spooled_file(base_dir=None):
     """Using SpooledTemporaryFile in text mode."""
     print("=== Text Mode SpooledTemporaryFile ===")
 
-    with tempfile.SpooledTemporaryFile(mode='w+', max_size=512, encoding='utf-8') as f:
+    with tempfile.SpooledTemporaryFile(dir=base_dir, mode='w+', max_size=512, encoding='utf-8') as f:
         print(f"Mode: {f.mode}")
         print(f"Encoding: {f.encoding}")
 
@@ -87,7 +110,7 @@ def text_mode_spooled_file():
     print()
 
 
-def json_processing():
+def json_processing(base_dir=None):
     """Processing JSON data with SpooledTemporaryFile."""
     print("=== JSON Processing with Spooled File ===")
 
@@ -104,10 +127,12 @@ def json_processing():
         }
     }
 
-    with tempfile.SpooledTemporaryFile(mode='w+', max_size=2048) as f:  # 2KB threshold
+    # Size the threshold from the payload so the document stays in memory;
+    # spooling is about avoiding the disk, not exercising rollover
+    payload = json_bytes(data)
+    with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=len(payload) + 4096) as f:
         # Write JSON
-        json.dump(data, f, indent=2)
-        f.flush()
+        f.write(payload)
 
         print(f"JSON written, file type: {type(f)}")
         print(f"File size: {f.tell()} bytes")
@@ -123,7 +148,7 @@ def json_processing():
     print()
 
 
-def streaming_data_processing():
+def streaming_data_processing(base_dir=None):
     """Simulating streaming data processing."""
     print("=== Streaming Data Processing ===")
 
@@ -131,16 +156,24 @@ def streaming_data_processing():
         """Generator that yields data chunks."""
         for i in range(10):
             yield f"Chunk {i}: {'data' * 50}\n".encode()  # ~250 bytes per chunk
-            time.sleep(0.01)  # Simulate I/O delay
 
-    with tempfile.SpooledTemporaryFile(max_size=1024) as f:  # 1KB threshold
+    # 8KB threshold keeps the ~2KB stream in memory
+    with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=8192) as f:
         print("Writing streaming data...")
 
+        # Accumulate chunks locally and hand them to the file in large
+        # writes instead of one write() per chunk
+        buf = bytearray()
         total_bytes = 0
         for chunk in generate_data_stream():
-            f.write(chunk)
+            buf += chunk
             total_bytes += len(chunk)
-            print(f"Written {total_bytes} bytes, type: {type(f)}")
+            print(f"Buffered {total_bytes} bytes")
+            if len(buf) >= STREAM_FLUSH_SIZE:
+                f.write(buf)
+                buf.clear()
+        if buf:
+            f.write(buf)
 
         print(f"Total data written: {total_bytes} bytes")
         print(f"Final file type: {type(f)}")
@@ -155,32 +188,34 @@ def streaming_data_processing():
     print()
 
 
-def memory_efficiency_comparison():
+def memory_efficiency_comparison(base_dir=None):
     """Compare memory usage with regular file."""
     print("=== Memory Efficiency Comparison ===")
 
     import sys
 
     # Test data
-    test_data = b"Test data " * 1000  # ~10KB
+    test_data = _payload(1000, b"Test data ")  # ~10KB
 
     print(f"Test data size: {len(test_data)} bytes")
 
-    # Spooled file
-    print("\nSpooledTemporaryFile:")
-    with tempfile.SpooledTemporaryFile(max_size=2048) as f:  # 2KB threshold
-        f.write(test_data)
-        print(f"File type: {type(f)}")
-        print(f"File size: {f.tell()}")
-
-        # Force rollover by writing more
-        f.write(b"Additional data " * 500)  # ~8KB more
-        print(f"After additional write: {type(f)}")
-        print(f"Total size: {f.tell()}")
+    # Measure each backend separately rather than rolling one file over
+    # mid-write, which would time the BytesIO -> disk copy instead.
+    # Note max_size=0 disables rollover, so the disk case uses 1 byte;
+    # a write rolls the file over once it grows past max_size.
+    for label, max_size in (("in memory", 1 << 20), ("rolled to disk", 1)):
+        print(f"\nSpooledTemporaryFile ({label}):")
+        start = time.perf_counter()
+        with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=max_size) as f:
+            f.write(test_data)
+            elapsed = time.perf_counter() - start
+            print(f"Rolled over: {f.tell() > max_size}")
+            print(f"File size: {f.tell()}")
+        print(f"Write time: {elapsed * 1e6:.1f} µs")
 
     # Regular NamedTemporaryFile for comparison
     print("\nNamedTemporaryFile (comparison):")
-    with tempfile.NamedTemporaryFile() as f:
+    with tempfile.NamedTemporaryFile(dir=base_dir) as f:
         f.write(test_data)
         print(f"File type: {type(f)}")
         print(f"File size: {f.tell()}")
@@ -188,19 +223,19 @@ def memory_efficiency_comparison():
     print()
 
 
-def error_handling():
+def error_handling(base_dir=None):
     """Demonstrate error handling with SpooledTemporaryFile."""
     print("=== Error Handling ===")
 
     try:
-        with tempfile.SpooledTemporaryFile(max_size=-1) as f:  # Invalid max_size
+        with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=-1) as f:  # Invalid max_size
             f.write(b"test")
     except (ValueError, TypeError) as e:
         print(f"Caught expected error: {e}")
 
     # Normal usage with error recovery
     try:
-        with tempfile.SpooledTemporaryFile(max_size=1024) as f:
+        with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=1024) as f:
             f.write(b"Some data")
 
             # Simulate processing error
@@ -216,38 +251,40 @@ def error_handling():
     print()
 
 
-def performance_benchmark():
+def _spooled_roundtrip(data, base_dir=None):
+    """Write ``data`` to a SpooledTemporaryFile and read it back."""
+    with tempfile.SpooledTemporaryFile(dir=base_dir, max_size=2048) as f:
+        f.write(data)
+        f.seek(0)
+        f.read()
+
+
+def _named_roundtrip(data, base_dir=None):
+    """Write ``data`` to a NamedTemporaryFile and read it back."""
+    with tempfile.NamedTemporaryFile(dir=base_dir) as f:
+        f.write(data)
+        f.seek(0)
+        f.read()
+
+
+def performance_benchmark(repeat=5, number=10, base_dir=None):
     """Simple performance comparison."""
     print("=== Performance Benchmark ===")
 
-    import time
-
     # Test data sizes
     sizes = [1000, 10000, 100000]  # 1KB, 10KB, 100KB
 
     for size in sizes:
-        data = b"x" * size
-
-        # Spooled file
-        start = time.time()
-        with tempfile.SpooledTemporaryFile(max_size=2048) as f:
-            f.write(data)
-            f.seek(0)
-            _ = f.read()
-        spooled_time = time.time() - start
-
-        # Regular temp file
-        start = time.time()
-        with tempfile.NamedTemporaryFile() as f:
-            f.write(data)
-            f.seek(0)
-            _ = f.read()
-        regular_time = time.time() - start
+        data = _payload(size)
+
+        # Best of ``repeat`` runs; the first run doubles as a warmup
+        spooled_time = min(Timer(lambda: _spooled_roundtrip(data, base_dir)).repeat(repeat, number)) / number
+        regular_time = min(Timer(lambda: _named_roundtrip(data, base_dir)).repeat(repeat, number)) / number
 
         print(f"Size {size} bytes:")
-        print(".4f")
-        print(".4f")
-        print(".2f")
+        print(f"  SpooledTemporaryFile: {spooled_time * 1e6:.2f} µs/op")
+        print(f"  NamedTemporaryFile:   {regular_time * 1e6:.2f} µs/op")
+        print(f"  Ratio (named/spooled): {regular_time / spooled_time:.2f}x")
         print()
 
     print()
@@ -259,14 +296,17 @@ def main():
     print("=" * 40)
     print()
 
-    basic_spooled_file()
-    rollover_behavior()
-    text_mode_spooled_file()
-    json_processing()
-    streaming_data_processing()
-    memory_efficiency_comparison()
-    error_handling()
-    performance_benchmark()
+    # Share one parent directory across the examples: one mkdir/rmtree
+    # pair for the whole run and all files land in the same place
+    with tempfile.TemporaryDirectory(prefix='examples_') as shared:
+        basic_spooled_file(base_dir=shared)
+        rollover_behavior(base_dir=shared)
+        text_mode_spooled_file(base_dir=shared)
+        json_processing(base_dir=shared)
+        streaming_data_processing(base_dir=shared)
+        memory_efficiency_comparison(base_dir=shared)
+        error_handling(base_dir=shared)
+        performance_benchmark(base_dir=shared)
 
     print("All examples completed!")
 
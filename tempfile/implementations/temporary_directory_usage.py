@@ -13,14 +13,14 @@ import shutil
 from pathlib import Path
 
 
-def basic_temporary_directory():
+def basic_temporary_directory(base_dir=None):
     """
     Basic usage of TemporaryDirectory - creates a temporary directory.
     """
     print("=== Basic TemporaryDirectory Usage ===")
 
     # Create a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir) as temp_dir:
         print(f"Temporary directory created: {temp_dir}")
 
         # Create some files in it
@@ -35,13 +35,13 @@ def basic_temporary_directory():
     print("Temporary directory automatically cleaned up")
 
 
-def temporary_directory_custom_prefix_suffix():
+def temporary_directory_custom_prefix_suffix(base_dir=None):
     """
     Demonstrate custom prefix and suffix with TemporaryDirectory.
     """
     print("\n=== Custom Prefix and Suffix ===")
 
-    with tempfile.TemporaryDirectory(prefix='myapp_', suffix='_temp') as temp_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir, prefix='myapp_', suffix='_temp') as temp_dir:
         print(f"Custom temp directory: {temp_dir}")
 
         # Create nested structure
@@ -53,21 +53,21 @@ def temporary_directory_custom_prefix_suffix():
     print("Custom temp directory cleaned up")
 
 
-def temporary_directory_persistence():
+def temporary_directory_persistence(base_dir=None):
     """
     Show how to control persistence of TemporaryDirectory.
     """
     print("\n=== Directory Persistence Control ===")
 
     # Automatic cleanup with context manager
-    with tempfile.TemporaryDirectory() as auto_cleanup:
+    with tempfile.TemporaryDirectory(dir=base_dir) as auto_cleanup:
         print(f"Auto-cleanup directory: {auto_cleanup}")
         with open(os.path.join(auto_cleanup, 'auto.txt'), 'w') as f:
             f.write("Auto cleanup")
     print(f"Auto-cleanup directory exists: {os.path.exists(auto_cleanup)}")
 
     # Manual cleanup control
-    manual_dir = tempfile.TemporaryDirectory()
+    manual_dir = tempfile.TemporaryDirectory(dir=base_dir)
     try:
         print(f"Manual directory: {manual_dir.name}")
         with open(os.path.join(manual_dir.name, 'manual.txt'), 'w') as f:
@@ -78,14 +78,14 @@ def temporary_directory_persistence():
         print(f"Directory exists after cleanup: {os.path.exists(manual_dir.name)}")
 
 
-def temporary_directory_with_custom_dir():
+def temporary_directory_with_custom_dir(base_dir=None):
     """
     Use TemporaryDirectory with custom parent directory.
     """
     print("\n=== Custom Parent Directory ===")
 
     # Create a custom temp directory
-    custom_temp = tempfile.mkdtemp(prefix='parent_')
+    custom_temp = tempfile.mkdtemp(dir=base_dir, prefix='parent_')
     print(f"Custom parent directory: {custom_temp}")
 
     try:
@@ -102,13 +102,25 @@ def temporary_directory_with_custom_dir():
         print("Parent directory cleaned up")
 
 
-def temporary_directory_with_pathlib():
+def write_bytes(path, data):
+    """
+    Write pre-encoded data to path with a single os.write, skipping the
+    buffered text layer that Path.write_text goes through.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def temporary_directory_with_pathlib(base_dir=None):
     """
     Demonstrate TemporaryDirectory usage with pathlib.
     """
     print("\n=== TemporaryDirectory with pathlib ===")
 
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir) as temp_dir:
         temp_path = Path(temp_dir)
 
         # Create directory structure
@@ -117,23 +129,27 @@ def temporary_directory_with_pathlib():
         (temp_path / 'logs').mkdir()
 
         # Create files
-        (temp_path / 'config' / 'settings.json').write_text('{"debug": true}')
-        (temp_path / 'data' / 'input' / 'data.csv').write_text('col1,col2\n1,2\n3,4')
+        write_bytes(temp_path / 'config' / 'settings.json', b'{"debug": true}')
+        write_bytes(temp_path / 'data' / 'input' / 'data.csv', b'col1,col2\n1,2\n3,4')
 
-        # List contents
+        # List contents; os.walk is built on scandir and yields the file
+        # names of each directory without a per-entry stat
         print("Directory structure:")
-        for item in sorted(temp_path.rglob('*')):
-            if item.is_file():
-                print(f"  File: {item.relative_to(temp_path)}")
+        found = []
+        for root, _dirs, files in os.walk(temp_dir):
+            rel = os.path.relpath(root, temp_dir)
+            found.extend(os.path.normpath(os.path.join(rel, name)) for name in files)
+        for name in sorted(found):
+            print(f"  File: {name}")
 
 
-def temporary_directory_integration():
+def temporary_directory_integration(base_dir=None):
     """
     Show integration with other tempfile classes.
     """
     print("\n=== Integration with Other Tempfile Classes ===")
 
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir) as temp_dir:
         # Create temporary files within the directory
         temp_files = []
         for i in range(3):
@@ -158,7 +174,7 @@ def temporary_directory_integration():
     print("All integrated temp files cleaned up with directory")
 
 
-def temporary_directory_error_handling():
+def temporary_directory_error_handling(base_dir=None):
     """
     Demonstrate error handling with TemporaryDirectory.
     """
@@ -166,7 +182,7 @@ def temporary_directory_error_handling():
 
     # Handle cleanup errors
     try:
-        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        with tempfile.TemporaryDirectory(dir=base_dir, ignore_cleanup_errors=True) as temp_dir:
             # Create a file and make it read-only (simulating cleanup issues)
             test_file = os.path.join(temp_dir, 'readonly.txt')
             with open(test_file, 'w') as f:
@@ -183,11 +199,30 @@ def temporary_directory_error_handling():
         print(f"Error occurred: {e}")
 
     # Normal operation
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir) as temp_dir:
         print(f"Normal operation in: {temp_dir}")
 
 
-def temporary_directory_use_cases():
+def make_subdirs(parent, names):
+    """
+    Create each of names directly under parent, resolving parent once
+    and issuing mkdirat-style calls relative to its fd. Platforms without
+    dir_fd support (Windows) create each directory by path instead.
+    """
+    if not (hasattr(os, 'O_DIRECTORY') and os.mkdir in os.supports_dir_fd):
+        for name in names:
+            os.mkdir(os.path.join(parent, name))
+        return
+
+    dfd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for name in names:
+            os.mkdir(name, dir_fd=dfd)
+    finally:
+        os.close(dfd)
+
+
+def temporary_directory_use_cases(base_dir=None):
     """
     Demonstrate practical use cases for TemporaryDirectory.
     """
@@ -195,13 +230,12 @@ def temporary_directory_use_cases():
 
     # Use case 1: Build workspace
     print("Build workspace:")
-    with tempfile.TemporaryDirectory(prefix='build_') as build_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir, prefix='build_') as build_dir:
         # Simulate build process
         source_dir = os.path.join(build_dir, 'src')
         build_output = os.path.join(build_dir, 'bin')
 
-        os.makedirs(source_dir)
-        os.makedirs(build_output)
+        make_subdirs(build_dir, ('src', 'bin'))
 
         # Create source files
         with open(os.path.join(source_dir, 'main.py'), 'w') as f:
@@ -211,19 +245,17 @@ def temporary_directory_use_cases():
         shutil.copy(os.path.join(source_dir, 'main.py'), build_output)
 
         print(f"Build completed in: {build_dir}")
-        print(f"Output files: {os.listdir(build_output)}")
+        print(f"Output files: {[e.name for e in os.scandir(build_output)]}")
 
     # Use case 2: Data processing pipeline
     print("\nData processing pipeline:")
-    with tempfile.TemporaryDirectory(prefix='pipeline_') as pipeline_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir, prefix='pipeline_') as pipeline_dir:
         # Stage input data
         input_dir = os.path.join(pipeline_dir, 'input')
         temp_dir = os.path.join(pipeline_dir, 'temp')
         output_dir = os.path.join(pipeline_dir, 'output')
 
-        os.makedirs(input_dir)
-        os.makedirs(temp_dir)
-        os.makedirs(output_dir)
+        make_subdirs(pipeline_dir, ('input', 'temp', 'output'))
 
         # Create input data
         with open(os.path.join(input_dir, 'data.txt'), 'w') as f:
@@ -243,10 +275,10 @@ def temporary_directory_use_cases():
             f.write(f"Processed: {len(processed_data)} characters")
 
         print(f"Pipeline completed in: {pipeline_dir}")
-        print(f"Stages: {os.listdir(pipeline_dir)}")
+        print(f"Stages: {[e.name for e in os.scandir(pipeline_dir)]}")
 
 
-def temporary_directory_performance():
+def temporary_directory_performance(base_dir=None):
     """
     Compare TemporaryDirectory performance characteristics.
     """
@@ -256,13 +288,27 @@ def temporary_directory_performance():
 
     # Measure creation time
     start_time = time.time()
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=base_dir) as temp_dir:
         creation_time = time.time() - start_time
 
-        # Create some content
-        for i in range(10):
-            with open(os.path.join(temp_dir, f'file_{i}.txt'), 'w') as f:
-                f.write(f'Content {i}\n' * 100)
+        # Create some content relative to one directory fd instead of
+        # resolving the full path for every file (Windows has neither
+        # O_DIRECTORY nor dir_fd support, so it opens by path)
+        if hasattr(os, 'O_DIRECTORY') and os.open in os.supports_dir_fd:
+            dfd = os.open(temp_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                def opener(name, flags):
+                    return os.open(name, flags, 0o666, dir_fd=dfd)
+
+                for i in range(10):
+                    with open(f'file_{i}.txt', 'w', opener=opener) as f:
+                        f.write(f'Content {i}\n' * 100)
+            finally:
+                os.close(dfd)
+        else:
+            for i in range(10):
+                with open(os.path.join(temp_dir, f'file_{i}.txt'), 'w') as f:
+                    f.write(f'Content {i}\n' * 100)
 
         # Measure cleanup time
         cleanup_start = time.time()
@@ -280,15 +326,18 @@ def main():
     print("TemporaryDirectory Implementation Examples")
     print("=" * 50)
 
-    basic_temporary_directory()
-    temporary_directory_custom_prefix_suffix()
-    temporary_directory_persistence()
-    temporary_directory_with_custom_dir()
-    temporary_directory_with_pathlib()
-    temporary_directory_integration()
-    temporary_directory_error_handling()
-    temporary_directory_use_cases()
-    temporary_directory_performance()
+    # Share one parent directory across the examples: one mkdir/rmtree
+    # pair for the whole run and all files land in the same place
+    with tempfile.TemporaryDirectory(prefix='examples_') as shared:
+        basic_temporary_directory(base_dir=shared)
+        temporary_directory_custom_prefix_suffix(base_dir=shared)
+        temporary_directory_persistence(base_dir=shared)
+        temporary_directory_with_custom_dir(base_dir=shared)
+        temporary_directory_with_pathlib(base_dir=shared)
+        temporary_directory_integration(base_dir=shared)
+        temporary_directory_error_handling(base_dir=shared)
+        temporary_directory_use_cases(base_dir=shared)
+        temporary_directory_performance(base_dir=shared)
 
     print("\n" + "=" * 50)
     print("All examples completed successfully!")
@@ -7,9 +7,43 @@ temporary files that are automatically cleaned up.
 """
 
 import tempfile
+import contextlib
 import os
+import shutil
+import stat
 import sys
 import io
+import timeit
+
+# Buffer size for temporary files. open() otherwise sizes the buffer from
+# the file's st_blksize (often 4 KiB); a write larger than the buffer goes
+# straight to the file either way, so the bigger buffer only batches runs
+# of small writes into fewer write() calls
+_TMP_BUF = 64 * 1024
+
+# Text payload for the I/O demo, encoded once at import
+STRING_DATA = "String data".encode('utf-8')
+
+# tmpfs is RAM-backed, so temporary files placed there never touch a block
+# device while still going through the normal fd/syscall path
+_TMP_DIR = "/dev/shm" if sys.platform.startswith("linux") and os.path.isdir("/dev/shm") else None
+
+
+def _reset(f):
+    """Rewind and empty a reused scratch file."""
+    f.seek(0)
+    f.truncate(0)
+
+
+def _scratch_file(scratch, factory, **kwargs):
+    """
+    Return a context manager for a working file: the shared scratch file
+    emptied for reuse when one is given, otherwise a new factory(**kwargs).
+    """
+    if scratch is None:
+        return factory(**kwargs)
+    _reset(scratch)
+    return contextlib.nullcontext(scratch)
 
 
 def basic_temporary_file():
@@ -19,7 +53,7 @@ def basic_temporary_file():
     print("=== Basic TemporaryFile Usage ===")
 
     # Create an anonymous temporary file
-    with tempfile.TemporaryFile() as temp_file:
+    with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as temp_file:
         print(f"Temporary file created (no accessible filename)")
 
         # Write some data
@@ -32,11 +66,12 @@ def basic_temporary_file():
         read_data = temp_file.read()
         print(f"Read back: {read_data.decode()}")
 
-        # File has no accessible name
-        try:
-            print(f"File name: {temp_file.name}")
-        except AttributeError:
-            print("TemporaryFile has no 'name' attribute (anonymous)")
+        # File has no accessible name (on POSIX, name is just the fd number)
+        name = getattr(temp_file, 'name', None)
+        if isinstance(name, str):
+            print(f"File name: {name}")
+        else:
+            print(f"TemporaryFile has no filename (anonymous, name={name!r})")
 
     # File is automatically deleted when exiting the context
     print("Anonymous temporary file automatically cleaned up")
@@ -50,14 +85,14 @@ def temporary_file_modes():
 
     # Binary mode (default)
     print("Binary mode:")
-    with tempfile.TemporaryFile() as f:
+    with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as f:
         f.write(b"Binary data for anonymous file")
         f.seek(0)
         print(f"  Read: {f.read()}")
 
     # Text mode
     print("Text mode:")
-    with tempfile.TemporaryFile(mode='w+', encoding='utf-8') as f:
+    with tempfile.TemporaryFile(mode='w+', encoding='utf-8', buffering=_TMP_BUF, dir=_TMP_DIR) as f:
         f.write("Text data: Hello 世界 (Unicode)")
         f.seek(0)
         print(f"  Read: {f.read()}")
@@ -71,17 +106,20 @@ def temporary_file_buffering():
 
     # Default buffering
     print("Default buffering:")
-    with tempfile.TemporaryFile() as f:
-        print(f"  Buffering: {f.buffering}")
+    with tempfile.TemporaryFile(dir=_TMP_DIR) as f:
+        # open() picks the buffer size from st_blksize, not io.DEFAULT_BUFFER_SIZE
+        print(f"  Type: {type(f).__name__} "
+              f"(st_blksize {os.fstat(f.fileno()).st_blksize} bytes)")
         f.write(b"Data with default buffering")
         print(f"  Raw: {f.raw}")
-        print(f"  Buffered: {hasattr(f, 'buffer')}")
-
-    # Line buffering
-    print("Line buffering:")
-    with tempfile.TemporaryFile(buffering=1) as f:
-        print(f"  Buffering: {f.buffering}")
-        f.write(b"Line buffered data\n")
+        print(f"  Buffered: {hasattr(f, 'raw')}")
+
+    # Larger buffer: fewer write() syscalls for many small writes. Binary
+    # files cannot be line buffered (buffering=1 only applies to text mode).
+    print("64 KiB buffering:")
+    with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as f:
+        print(f"  Type: {type(f).__name__} ({_TMP_BUF} byte buffer)")
+        f.write(b"Buffered data\n")
         f.write(b"Another line\n")
         f.seek(0)
         print(f"  Read: {f.read().decode()}")
@@ -94,19 +132,63 @@ def temporary_file_vs_named_temporary_file():
     print("\n=== TemporaryFile vs NamedTemporaryFile ===")
 
     print("TemporaryFile (anonymous):")
-    with tempfile.TemporaryFile() as f:
+    with tempfile.TemporaryFile(dir=_TMP_DIR) as f:
         f.write(b"Anonymous data")
-        print(f"  Has name attribute: {hasattr(f, 'name')}")
+        name = getattr(f, 'name', None)
+        print(f"  Has filename: {isinstance(name, str)}")
         print(f"  File descriptor: {f.fileno()}")
 
     print("NamedTemporaryFile (named):")
-    with tempfile.NamedTemporaryFile() as f:
+    with tempfile.NamedTemporaryFile(dir=_TMP_DIR) as f:
         f.write(b"Named data")
-        print(f"  Has name attribute: {hasattr(f, 'name')}")
+        name = getattr(f, 'name', None)
+        print(f"  Has filename: {isinstance(name, str)}")
         print(f"  Filename: {f.name}")
         print(f"  File exists: {os.path.exists(f.name)}")
 
 
+def _open_tmpfile(dirpath):
+    """
+    Open an unnamed file in dirpath with O_TMPFILE, which skips creating
+    and later unlinking a directory entry. Falls back to a
+    NamedTemporaryFile(delete=False) where O_TMPFILE is unsupported.
+    """
+    if hasattr(os, 'O_TMPFILE'):
+        try:
+            fd = os.open(dirpath, os.O_TMPFILE | os.O_RDWR, 0o600)
+        except OSError:
+            pass
+        else:
+            return os.fdopen(fd, 'w+b', buffering=_TMP_BUF)
+    return tempfile.NamedTemporaryFile(dir=dirpath, delete=False, buffering=_TMP_BUF)
+
+
+def _publish(f, target):
+    """Give a file from _open_tmpfile the name target."""
+    if not isinstance(f.name, str):
+        # Link the unnamed inode into the directory through /proc. Passing
+        # a dir fd makes os.link use linkat() with AT_SYMLINK_FOLLOW;
+        # plain link() would try to link the /proc symlink itself.
+        try:
+            dfd = os.open(os.path.dirname(target) or '.', os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.link(f"/proc/self/fd/{f.fileno()}", os.path.basename(target),
+                        dst_dir_fd=dfd, follow_symlinks=True)
+            finally:
+                os.close(dfd)
+            return
+        except OSError:
+            # No /proc, or target already exists (FileExistsError): copy
+            # the data into a named file and move that into place instead
+            f.seek(0)
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(target) or '.',
+                                             delete=False) as named:
+                shutil.copyfileobj(f, named)
+            f = named
+    # The file has a name; just move it
+    os.replace(f.name, target)
+
+
 def temporary_file_external_access():
     """
     Show limitations of TemporaryFile for external program access.
@@ -115,7 +197,7 @@ def temporary_file_external_access():
 
     # TemporaryFile cannot be accessed by external programs
     # because it has no filename
-    with tempfile.TemporaryFile() as temp_file:
+    with tempfile.TemporaryFile(dir=_TMP_DIR) as temp_file:
         temp_file.write(b"Data for external processing")
 
         # Cannot pass to external programs
@@ -127,35 +209,37 @@ def temporary_file_external_access():
         except AttributeError as e:
             print(f"Expected error: {e}")
 
-    # Correct approach for external access
-    print("\nCorrect approach with NamedTemporaryFile:")
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+    # Correct approach for external access: write an anonymous file and
+    # only give it a name once it should be published
+    print("\nCorrect approach with an anonymous file linked into place:")
+    dirpath = _TMP_DIR or tempfile.gettempdir()
+    target = os.path.join(dirpath, f"external_{os.getpid()}.dat")
+    with _open_tmpfile(dirpath) as temp_file:
         temp_file.write(b"Data for external processing")
-        temp_file.close()  # Close before external access
+        temp_file.flush()
+        _publish(temp_file, target)
 
-        print(f"File accessible at: {temp_file.name}")
-        print(f"File exists: {os.path.exists(temp_file.name)}")
+    print(f"File accessible at: {target}")
+    print(f"File exists: {os.path.exists(target)}")
 
-        # Now external programs can access it
-        # external_program(temp_file.name)
+    # Now external programs can access it
+    # external_program(target)
 
-        # Manual cleanup
-        os.unlink(temp_file.name)
-        print("File manually cleaned up")
+    # Manual cleanup
+    os.unlink(target)
+    print("File manually cleaned up")
 
 
-def temporary_file_with_io_operations():
+def temporary_file_with_io_operations(scratch=None):
     """
     Demonstrate I/O operations with TemporaryFile.
     """
     print("\n=== I/O Operations with TemporaryFile ===")
 
-    with tempfile.TemporaryFile(mode='w+b') as f:
-        # Write various data types
-        f.write(b"Binary data\n")
-        f.write("String data".encode('utf-8'))
-        f.write(b"\n")
-        f.write(bytearray(b"Bytearray data"))
+    with _scratch_file(scratch, tempfile.TemporaryFile,
+                       mode='w+b', buffering=_TMP_BUF, dir=_TMP_DIR) as f:
+        # Write data from various sources in a single call
+        f.write(b"Binary data\n" + STRING_DATA + b"\nBytearray data")
 
         # Seek operations
         print(f"File size: {f.tell()} bytes")
@@ -166,11 +250,10 @@ def temporary_file_with_io_operations():
         all_data = f.read()
         print(f"  {all_data}")
 
-        # Read line by line
-        f.seek(0)
+        # Read line by line, splitting the data already read in one pass
         print("Reading line by line:")
-        for line in f:
-            print(f"  Line: {line.decode().strip()}")
+        for line in all_data.splitlines():
+            print(f"  Line: {line.decode()}")
 
         # Read specific amount
         f.seek(0)
@@ -184,7 +267,7 @@ def temporary_file_context_manager_details():
     """
     print("\n=== Context Manager Behavior ===")
 
-    temp_file = tempfile.TemporaryFile()
+    temp_file = tempfile.TemporaryFile(dir=_TMP_DIR)
     print("TemporaryFile created")
 
     try:
@@ -210,26 +293,65 @@ def temporary_file_error_handling():
     print("\n=== Error Handling ===")
 
     try:
-        with tempfile.TemporaryFile() as f:
+        with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as f:
             # Try to perform invalid operation
             f.write("String data to binary file")
     except TypeError as e:
         print(f"Caught expected type error: {e}")
 
     # Proper usage
-    with tempfile.TemporaryFile(mode='w+b') as f:
+    with tempfile.TemporaryFile(mode='w+b', buffering=_TMP_BUF, dir=_TMP_DIR) as f:
         f.write(b"Proper binary data")
         f.seek(0)
         print(f"Successfully wrote: {f.read()}")
 
-    # Handle disk space issues
-    try:
-        with tempfile.TemporaryFile() as f:
-            # Try to write more data than available disk space
-            large_data = b"X" * (1024 * 1024 * 1024)  # 1GB
-            f.write(large_data)
-    except OSError as e:
-        print(f"Disk space error (expected): {e}")
+    # Handle disk space issues (opt-in: set DEMO_DISK_FULL=1)
+    if os.environ.get("DEMO_DISK_FULL"):
+        try:
+            with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as f:
+                # Grow the file to 1TB without materializing any data; the
+                # filesystem may refuse (EFBIG/ENOSPC) or create it sparse
+                os.ftruncate(f.fileno(), 1 << 40)
+                print(f"Sparse file extended to {os.fstat(f.fileno()).st_size} bytes")
+        except OSError as e:
+            print(f"Disk space error (expected): {e}")
+
+
+def _preallocate(f, size):
+    """Reserve size bytes for f, falling back to extending it with truncate."""
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError:
+            pass
+    f.truncate(size)
+
+
+def _drain_to(src_fd, dst_fd, count):
+    """
+    Copy count bytes from the start of src_fd to dst_fd without passing
+    them through user space: copy_file_range where the kernel allows it,
+    sendfile otherwise (e.g. when dst_fd is /dev/null).
+    """
+    # copy_file_range only accepts regular files on both ends
+    use_copy_range = (hasattr(os, 'copy_file_range')
+                      and stat.S_ISREG(os.fstat(dst_fd).st_mode))
+    offset = 0
+    while offset < count:
+        if use_copy_range:
+            sent = os.copy_file_range(src_fd, dst_fd, count - offset, offset)
+        else:
+            sent = os.sendfile(dst_fd, src_fd, offset, count - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _bench(fn, n=50):
+    """Best per-call time of fn in seconds, after one warm-up call."""
+    fn()
+    return min(timeit.repeat(fn, number=n, repeat=5)) / n
 
 
 def temporary_file_performance_comparison():
@@ -238,56 +360,100 @@ def temporary_file_performance_comparison():
     """
     print("\n=== Performance Comparison ===")
 
-    import time
     test_data = b"X" * (1024 * 1024)  # 1MB
 
-    # TemporaryFile
-    start_time = time.time()
-    with tempfile.TemporaryFile() as f:
-        f.write(test_data)
-        f.seek(0)
-        _ = f.read()
-    temp_time = time.time() - start_time
-
-    # NamedTemporaryFile
-    start_time = time.time()
-    with tempfile.NamedTemporaryFile() as f:
-        f.write(test_data)
-        f.seek(0)
-        _ = f.read()
-    named_time = time.time() - start_time
-
-    # BytesIO (memory only)
-    start_time = time.time()
-    buffer = io.BytesIO()
-    buffer.write(test_data)
-    buffer.seek(0)
-    _ = buffer.read()
-    memory_time = time.time() - start_time
-
-    print(".4f")
-    print(".4f")
-    print(".4f")
+    def _temporary_file():
+        with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as f:
+            f.write(test_data)
+            f.seek(0)
+            f.read()
+
+    def _named_temporary_file():
+        with tempfile.NamedTemporaryFile(dir=_TMP_DIR) as f:
+            f.write(test_data)
+            f.seek(0)
+            f.read()
+
+    # Same as above with the blocks reserved up front, so the write is a
+    # pure data copy with no per-extent allocation
+    def _temporary_file_fallocate():
+        with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as f:
+            _preallocate(f, len(test_data))
+            f.write(test_data)
+            f.seek(0)
+            f.read()
+
+    def _named_temporary_file_fallocate():
+        with tempfile.NamedTemporaryFile(dir=_TMP_DIR) as f:
+            _preallocate(f, len(test_data))
+            f.write(test_data)
+            f.seek(0)
+            f.read()
+
+    # Read back inside the kernel instead of into a Python bytes object
+    def _temporary_file_kernel_read():
+        with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as f:
+            f.write(test_data)
+            f.flush()
+            _drain_to(f.fileno(), devnull, len(test_data))
+
+    # Memory until max_size, then disk
+    def _spooled_temporary_file():
+        with tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024, buffering=_TMP_BUF) as f:
+            f.write(test_data)
+            f.seek(0)
+            f.read()
+
+    # Memory only; getbuffer() exposes the contents as a zero-copy view
+    # instead of read() allocating a second 1MB bytes object
+    def _bytes_io():
+        buffer = io.BytesIO()
+        buffer.write(test_data)
+        with buffer.getbuffer() as view:
+            len(view)
+
+    rows = [
+        ("TemporaryFile", _temporary_file),
+        ("NamedTemporaryFile", _named_temporary_file),
+        ("TemporaryFile + kernel read", _temporary_file_kernel_read),
+        ("TemporaryFile + fallocate", _temporary_file_fallocate),
+        ("NamedTemporaryFile + fallocate", _named_temporary_file_fallocate),
+        ("SpooledTemporaryFile", _spooled_temporary_file),
+        ("BytesIO (getbuffer view)", _bytes_io),
+    ]
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        for label, fn in rows:
+            print(f"{label + ':':<32}{_bench(fn) * 1e9:>14,.0f} ns")
+    finally:
+        os.close(devnull)
 
     print("\nPerformance notes:")
     print("- TemporaryFile: Anonymous, auto-cleanup, disk-based")
     print("- NamedTemporaryFile: Named, auto-cleanup, disk-based")
-    print("- BytesIO: Anonymous, manual cleanup, memory-based")
+    if _TMP_DIR:
+        print(f"  (both created in {_TMP_DIR}, a RAM-backed tmpfs, in this run)")
+    print("- SpooledTemporaryFile: Anonymous, auto-cleanup, memory-based "
+          "until max_size (rollover() forces it to disk)")
+    print("- BytesIO: Anonymous, manual cleanup, memory-based "
+          "(read back as a view, no second copy)")
 
 
-def temporary_file_use_cases():
+def temporary_file_use_cases(scratch=None):
     """
     Demonstrate practical use cases for TemporaryFile.
     """
     print("\n=== Practical Use Cases ===")
 
+    # When a shared scratch file is passed, each block reuses it instead
+    # of creating its own TemporaryFile.
+
     # Use case 1: Data processing pipeline
     print("Data processing pipeline:")
-    with tempfile.TemporaryFile(mode='w+b') as temp_buffer:
-        # Simulate processing chunks
-        for i in range(5):
-            chunk = f"Chunk {i} data\n".encode()
-            temp_buffer.write(chunk)
+    with _scratch_file(scratch, tempfile.TemporaryFile,
+                       mode='w+b', buffering=_TMP_BUF, dir=_TMP_DIR) as temp_buffer:
+        # Simulate processing chunks, written in one call
+        temp_buffer.write("".join(f"Chunk {i} data\n" for i in range(5)).encode())
 
         # Process all data at once
         temp_buffer.seek(0)
@@ -296,54 +462,82 @@ def temporary_file_use_cases():
 
     # Use case 2: Temporary storage for calculations
     print("\nTemporary calculation storage:")
-    with tempfile.TemporaryFile() as calc_file:
-        results = []
-        for i in range(10):
-            result = i * i
-            results.append(result)
-            calc_file.write(f"{result}\n".encode())
+    with _scratch_file(scratch, tempfile.TemporaryFile,
+                       mode='w+b', buffering=_TMP_BUF, dir=_TMP_DIR) as calc_file:
+        results = [i * i for i in range(10)]
+        calc_file.write("\n".join(map(str, results)).encode() + b"\n")
 
         calc_file.seek(0)
-        stored_results = [int(line.decode().strip())
-                         for line in calc_file if line.strip()]
+        stored_results = [int(x) for x in calc_file.read().split()]
         print(f"Stored {len(stored_results)} calculation results")
 
     # Use case 3: Buffer for network data
     print("\nNetwork data buffering:")
-    with tempfile.TemporaryFile() as network_buffer:
+    with _scratch_file(scratch, tempfile.TemporaryFile,
+                       mode='w+b', buffering=_TMP_BUF, dir=_TMP_DIR) as network_buffer:
         # Simulate receiving network packets
         packets = [b"Packet 1", b"Packet 2", b"Packet 3"]
-        for packet in packets:
-            network_buffer.write(packet)
-            network_buffer.write(b"\n")
+        network_buffer.write(b"\n".join(packets) + b"\n")
+
+        # The packet count is already known; no need to read back and scan
+        print(f"Buffered {len(packets)} network packets ({network_buffer.tell()} bytes)")
+
 
-        # Read all packets
-        network_buffer.seek(0)
-        all_packets = network_buffer.read()
-        packet_count = all_packets.count(b"\n")
-        print(f"Buffered {packet_count} network packets")
+@contextlib.contextmanager
+def _buffered_stdout(buffer_size=_TMP_BUF):
+    """
+    Send print() output through a buffer_size buffer so it reaches the
+    terminal in a few large writes instead of one write per line. The
+    caller flushes sys.stdout wherever the output should appear.
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError):
+        # Not backed by a real fd (e.g. already redirected); leave it alone
+        yield
+        return
+
+    sys.stdout.flush()
+    raw = io.FileIO(fd, 'w', closefd=False)
+    out = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=buffer_size),
+                           encoding=sys.stdout.encoding, errors=sys.stdout.errors)
+    try:
+        with contextlib.redirect_stdout(out):
+            yield
+    finally:
+        out.close()  # flushes; the underlying fd stays open
 
 
 def main():
     """
     Run all TemporaryFile implementation examples.
     """
-    print("TemporaryFile Implementation Examples")
-    print("=" * 50)
-
-    basic_temporary_file()
-    temporary_file_modes()
-    temporary_file_buffering()
-    temporary_file_vs_named_temporary_file()
-    temporary_file_external_access()
-    temporary_file_with_io_operations()
-    temporary_file_context_manager_details()
-    temporary_file_error_handling()
-    temporary_file_performance_comparison()
-    temporary_file_use_cases()
-
-    print("\n" + "=" * 50)
-    print("All examples completed successfully!")
+    with _buffered_stdout():
+        print("TemporaryFile Implementation Examples")
+        print("=" * 50)
+
+        # One scratch file reused by the demos that don't exercise the
+        # create/cleanup lifecycle themselves
+        with tempfile.TemporaryFile(buffering=_TMP_BUF, dir=_TMP_DIR) as scratch:
+            for demo, args in (
+                (basic_temporary_file, ()),
+                (temporary_file_modes, ()),
+                (temporary_file_buffering, ()),
+                (temporary_file_vs_named_temporary_file, ()),
+                (temporary_file_external_access, ()),
+                (temporary_file_with_io_operations, (scratch,)),
+                (temporary_file_context_manager_details, ()),
+                (temporary_file_error_handling, ()),
+                (temporary_file_performance_comparison, ()),
+                (temporary_file_use_cases, (scratch,)),
+            ):
+                demo(*args)
+                # One write per demo, so output keeps pace with the run
+                # and stays ordered with anything written to stderr
+                sys.stdout.flush()
+
+        print("\n" + "=" * 50)
+        print("All examples completed successfully!")
 
 
 if __name__ == "__main__":